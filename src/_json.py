@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+JSON序列化模块
+优先使用orjson进行解析和序列化，未安装时回退到标准库json
+"""
+
+import json
+
+# orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，两种实现可统一捕获
+JSONDecodeError = json.JSONDecodeError
+
+try:
+    import orjson
+
+    loads = orjson.loads
+
+    def dumps(obj):
+        """
+        将对象序列化为JSON字符串
+
+        Args:
+            obj: 需要序列化的对象
+
+        Returns:
+            str: JSON字符串
+        """
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+    def dumpb(obj, indent=False):
+        """
+        将对象序列化为UTF-8编码的JSON字节串
+
+        Args:
+            obj: 需要序列化的对象
+            indent: 是否使用缩进格式输出
+
+        Returns:
+            bytes: JSON字节串
+        """
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+
+except ImportError:
+    loads = json.loads
+
+    def dumps(obj):
+        """
+        将对象序列化为JSON字符串
+
+        Args:
+            obj: 需要序列化的对象
+
+        Returns:
+            str: JSON字符串
+        """
+        return json.dumps(obj, ensure_ascii=False)
+
+    def dumpb(obj, indent=False):
+        """
+        将对象序列化为UTF-8编码的JSON字节串
+
+        Args:
+            obj: 需要序列化的对象
+            indent: 是否使用缩进格式输出
+
+        Returns:
+            bytes: JSON字节串
+        """
+        return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode('utf-8')
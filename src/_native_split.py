@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+编译的分句边界扫描模块
+依赖numpy和numba，只在处理超大文档时由文档处理模块按需导入
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def _is_space(c):
+    # 与Unicode模式下的\s一致（即 str.isspace），包括不换行空格和全角空格
+    if c <= 0x20:
+        return c == 0x20 or 0x09 <= c <= 0x0D or 0x1C <= c <= 0x1F
+    return (c == 0x85 or c == 0xA0 or c == 0x1680 or 0x2000 <= c <= 0x200A
+            or c == 0x2028 or c == 0x2029 or c == 0x202F or c == 0x205F or c == 0x3000)
+
+
+@njit(cache=True)
+def _find_sentence_ends(codepoints):
+    """
+    扫描句子结束位置，与 SENTENCE_END_PATTERN 的匹配结果一致
+
+    Args:
+        codepoints: 文本的Unicode码点数组
+
+    Returns:
+        numpy.ndarray: 每个句子结束标记之后的位置
+    """
+    n = codepoints.shape[0]
+    ends = np.empty(n, dtype=np.int64)
+    count = 0
+    i = 0
+    while i < n:
+        c = codepoints[i]
+        k = -1
+        if c == 0x3002 and i + 2 < n and codepoints[i + 1] == 0xFF1F and codepoints[i + 2] == 0xFF01:
+            k = i + 3  # 。？！
+        elif c == 0x2E and i + 1 < n and _is_space(codepoints[i + 1]):
+            k = i + 2  # 英文句号后接空白
+        elif c == 0x3F or c == 0x21:
+            k = i + 1  # ? 或 !
+
+        if k >= 0:
+            # 可选的引号，之后必须是文本末尾或空白
+            end = -1
+            if k < n and (codepoints[k] == 0x22 or codepoints[k] == 0x27) and (k + 1 == n or _is_space(codepoints[k + 1])):
+                end = k + 1
+            elif k == n or _is_space(codepoints[k]):
+                end = k
+
+            if end >= 0:
+                ends[count] = end
+                count += 1
+                i = end
+                continue
+        i += 1
+    return ends[:count]
+
+
+def sentence_ends(text):
+    """
+    查找文本中所有句子结束标记之后的位置
+
+    Args:
+        text: 段落文本
+
+    Returns:
+        list: 句子结束位置列表
+    """
+    codepoints = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    return _find_sentence_ends(codepoints).tolist()
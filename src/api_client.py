@@ -6,16 +6,46 @@ API客户端模块
 负责与AI API的通信，发送请求并处理响应
 """
 
-import json
+import asyncio
+import hashlib
 import logging
+import os
+import re
+import sqlite3
+import threading
+import aiohttp
 import requests
 import time
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException, Timeout, ConnectionError
+from urllib3.util.retry import Retry
+
+from src._json import loads, dumpb, JSONDecodeError
 
-# 配置日志
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 需要重试的HTTP状态码（限流和服务端错误）
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# 校对失败结果的缓存有效期（秒），过期后重新请求API
+NEGATIVE_CACHE_TTL = 300
+
+# 校对结果必须包含的字段
+_REQUIRED_KEYS = frozenset(('content_0', 'wrong', 'annotation', 'content_1'))
+
+# 匹配Markdown代码块（可带json语言标记），提取其中的内容
+_CODE_BLOCK_RE = re.compile(r'^\s*```(?:json)?\s*(.*?)\s*```', re.DOTALL)
+
+# 批量校对时追加到系统提示词后的说明，要求模型按编号顺序返回结果数组
+BATCH_PROMPT_SUFFIX = """
+
+接下来会一次给出多个带编号的句子，请逐句按上述结构检查，并按编号顺序输出如下格式的单个 JSON 对象（不要包含代码块标记）：
+{"results":[第1个句子的检查结果, 第2个句子的检查结果, ...]}
+results 数组的长度必须与句子数量一致。"""
+
+# 构建请求体模板时句子位置的占位符
+PAYLOAD_PLACEHOLDER = "\x00sentence\x00"
+
 class ApiClient:
     """API客户端类，负责与AI API的通信"""
     
@@ -31,6 +61,201 @@ class ApiClient:
         self.model = self.config.get('model', '')
         self.api_key = self.config.get('api_key', '')
         self.system_prompt = self.config.get('system_prompt', '')
+        self.batch_size = self.config.get('batch_size', 8)  # 每个请求包含的句子数
+        self._build_payload_templates()
+        
+        # 复用连接的会话，避免每个句子都重新建立TCP和TLS连接
+        self._session = self._create_session()
+        
+        # 校对结果的本地缓存，未修改的句子再次校对时无需请求API
+        cache_path = self.config.get('cache_path')
+        if not cache_path:
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            cache_path = os.path.join(base_dir, 'proofread_cache.db')
+        self._cache_path = cache_path
+        self._cache_lock = threading.Lock()
+        # 本次运行中已知的成功校对结果，命中时无需查询数据库
+        self._memo = {}
+        # 数据库在首次读写缓存时才打开，只用于测试连接的客户端不会打开
+        self._cache_db = None
+        self._cache_opened = False
+        
+    def _open_cache(self, cache_path):
+        """
+        打开校对结果缓存数据库
+        
+        Args:
+            cache_path: 缓存数据库文件路径
+            
+        Returns:
+            sqlite3.Connection: 数据库连接，打开失败时返回None（不使用缓存）
+        """
+        try:
+            db = sqlite3.connect(cache_path, isolation_level=None, check_same_thread=False)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key BLOB PRIMARY KEY, response BLOB NOT NULL, ok INTEGER NOT NULL, expires REAL)"
+            )
+            return db
+        except sqlite3.Error as e:
+            logger.error(f"打开校对缓存失败，将不使用缓存: {str(e)}")
+            return None
+            
+    def _get_cache_db(self):
+        """
+        获取缓存数据库连接，首次调用时打开数据库
+        
+        Returns:
+            sqlite3.Connection: 数据库连接，打开失败或客户端已关闭时返回None
+        """
+        with self._cache_lock:
+            if not self._cache_opened:
+                self._cache_db = self._open_cache(self._cache_path)
+                self._cache_opened = True
+            return self._cache_db
+            
+    def close(self):
+        """关闭HTTP会话和缓存数据库"""
+        self._session.close()
+        with self._cache_lock:
+            if self._cache_db is not None:
+                self._cache_db.close()
+                self._cache_db = None
+            # 关闭后不再重新打开数据库
+            self._cache_opened = True
+            
+    def _cache_key(self, sentence):
+        """
+        计算句子的缓存键，模型或提示词变化时缓存自动失效
+        
+        Args:
+            sentence: 需要校对的句子
+            
+        Returns:
+            bytes: 缓存键
+        """
+        raw = f"{self.model}\x00{self.system_prompt}\x00{sentence}".encode('utf-8')
+        return hashlib.blake2b(raw, digest_size=16).digest()
+        
+    def _cache_get(self, sentence, include_failures=True):
+        """
+        查询句子的缓存校对结果
+        
+        Args:
+            sentence: 需要校对的句子
+            include_failures: 是否返回有效期内的失败结果，为False时失败结果按未命中处理
+            
+        Returns:
+            tuple: (是否成功, 校对结果或错误信息)，未命中时返回None
+        """
+        key = self._cache_key(sentence)
+        cached = self._memo.get(key)
+        if cached is not None:
+            return cached
+            
+        db = self._get_cache_db()
+        if db is None:
+            return None
+            
+        try:
+            with self._cache_lock:
+                row = db.execute(
+                    "SELECT response, ok, expires FROM cache WHERE key=?",
+                    (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"读取校对缓存失败: {str(e)}")
+            return None
+            
+        if row is None:
+            return None
+            
+        response, ok, expires = row
+        if not ok and not include_failures:
+            return None
+        if expires is not None and expires < time.time():
+            return None
+            
+        if ok:
+            cached = (True, loads(response))
+            self._memo[key] = cached
+            return cached
+        return False, response.decode('utf-8')
+        
+    def _cache_put(self, sentence, success, result):
+        """
+        缓存句子的校对结果，失败结果只在有效期内生效
+        
+        Args:
+            sentence: 需要校对的句子
+            success: 是否成功
+            result: 校对结果或错误信息
+        """
+        key = self._cache_key(sentence)
+        if success:
+            self._memo[key] = (True, result)
+            
+        db = self._get_cache_db()
+        if db is None:
+            return
+            
+        if success:
+            response, expires = dumpb(result), None
+        else:
+            response, expires = result.encode('utf-8'), time.time() + NEGATIVE_CACHE_TTL
+            
+        try:
+            with self._cache_lock:
+                db.execute(
+                    "INSERT OR REPLACE INTO cache (key, response, ok, expires) VALUES (?, ?, ?, ?)",
+                    (key, response, int(success), expires)
+                )
+        except sqlite3.Error as e:
+            logger.error(f"写入校对缓存失败: {str(e)}")
+            
+    def get_cached(self, sentence):
+        """
+        查询句子已有的成功校对结果，用于在发送请求前跳过已校对过的句子
+        
+        Args:
+            sentence: 需要校对的句子
+            
+        Returns:
+            tuple: (True, 校对结果)，没有成功的缓存结果时返回None
+        """
+        if not sentence.strip():
+            return None
+        return self._cache_get(sentence, include_failures=False)
+        
+    def _create_session(self):
+        """
+        创建带连接池的HTTP会话
+        
+        Returns:
+            requests.Session: 配置好连接池和状态码重试的会话
+        """
+        session = requests.Session()
+        
+        # 仅对限流和服务端错误状态码重试，超时和连接错误由调用方的重试循环处理
+        retry = Retry(
+            total=3,
+            connect=0,
+            read=0,
+            status=3,
+            backoff_factor=0.5,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(['POST']),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=retry)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        
+        session.headers.update({
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}"
+        })
+        return session
         
     def update_config(self, config):
         """
@@ -44,6 +269,11 @@ class ApiClient:
         self.model = config.get('model', self.model)
         self.api_key = config.get('api_key', self.api_key)
         self.system_prompt = config.get('system_prompt', self.system_prompt)
+        self.batch_size = config.get('batch_size', self.batch_size)
+        self._build_payload_templates()
+        
+        # 只刷新认证头，保留已建立的连接
+        self._session.headers["Authorization"] = f"Bearer {self.api_key}"
         
     def check_connection(self):
         """
@@ -54,11 +284,6 @@ class ApiClient:
         """
         try:
             # 构建一个简单的请求来测试连接
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.api_key}"
-            }
-            
             data = {
                 "model": self.model,
                 "messages": [
@@ -68,11 +293,10 @@ class ApiClient:
                 "stream": False
             }
             
-            response = requests.post(
+            response = self._session.post(
                 self.api_url,
-                headers=headers,
-                json=data,
-                timeout=10
+                data=dumpb(data),
+                timeout=(5, 10)
             )
             
             if response.status_code == 200:
@@ -84,47 +308,96 @@ class ApiClient:
             logger.error(f"API连接测试失败: {str(e)}")
             return False, f"API连接失败: {str(e)}"
     
-    def proofread_sentence(self, sentence):
+    def _build_request_data(self, sentence, system_prompt=None):
         """
-        发送句子到API进行校对
+        构建校对请求的数据
         
         Args:
-            sentence: 需要校对的句子
+            sentence: 需要校对的句子（批量校对时为带编号的句子列表文本）
+            system_prompt: 系统提示词，默认使用配置中的提示词
             
         Returns:
-            tuple: (是否成功, 校对结果或错误信息)
+            dict: 请求数据
         """
-        if not sentence.strip():
-            return False, "句子为空，跳过校对"
-            
-        # 设置重试参数
-        max_retries = 3  # 最大重试次数
-        retry_delay = 2  # 重试间隔（秒）
-        timeout_value = 60  # 超时时间（秒）
-        
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.api_key}"
-        }
-        
-        data = {
+        return {
             "model": self.model,
             "messages": [
-                {"role": "system", "content": self.system_prompt},
+                {"role": "system", "content": system_prompt or self.system_prompt},
                 {"role": "user", "content": sentence}
             ],
             "stream": False
         }
         
-        logger.info(f"发送API请求: {json.dumps(data, ensure_ascii=False)}")
+    def _build_payload_template(self, system_prompt):
+        """
+        预先序列化请求体，以句子为界拆成前后两段
+        
+        Args:
+            system_prompt: 系统提示词
+            
+        Returns:
+            tuple: (句子之前的字节串, 句子之后的字节串)
+        """
+        payload = dumpb(self._build_request_data(PAYLOAD_PLACEHOLDER, system_prompt))
+        prefix, _, suffix = payload.rpartition(dumpb(PAYLOAD_PLACEHOLDER))
+        return prefix, suffix
+        
+    def _build_payload_templates(self):
+        """模型或提示词变化时重新生成单句和批量请求的请求体模板"""
+        self._payload_template = self._build_payload_template(self.system_prompt)
+        self._batch_payload_template = self._build_payload_template(self.system_prompt + BATCH_PROMPT_SUFFIX)
+        
+    def _build_request_payload(self, sentence):
+        """
+        构建单句校对的请求体，只需序列化句子并与模板拼接
+        
+        Args:
+            sentence: 需要校对的句子
+            
+        Returns:
+            bytes: 请求体
+        """
+        prefix, suffix = self._payload_template
+        return prefix + dumpb(sentence) + suffix
+        
+    def _build_batch_payload(self, sentences):
+        """
+        构建批量校对的请求体，多个句子编号后放在同一条消息中
+        
+        Args:
+            sentences: 需要校对的句子列表
+            
+        Returns:
+            bytes: 请求体
+        """
+        numbered = "\n".join(f"{i}. {sentence}" for i, sentence in enumerate(sentences, 1))
+        prefix, suffix = self._batch_payload_template
+        return prefix + dumpb(numbered) + suffix
+        
+    def _post(self, payload):
+        """
+        发送请求，超时或连接错误时重试
+        
+        Args:
+            payload: 已序列化的请求体
+            
+        Returns:
+            tuple: (是否成功, 已解析的API响应或错误信息)
+        """
+        # 设置重试参数
+        max_retries = 3  # 最大重试次数
+        retry_delay = 2  # 重试间隔（秒）
+        timeout_value = (5, 60)  # 连接超时和读取超时（秒）
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"发送API请求: {payload.decode('utf-8')}")
         
         # 实现重试机制
         for retry in range(max_retries):
             try:
-                response = requests.post(
+                response = self._session.post(
                     self.api_url,
-                    headers=headers,
-                    json=data,
+                    data=payload,
                     timeout=timeout_value
                 )
                 
@@ -132,53 +405,10 @@ class ApiClient:
                     logger.error(f"API请求失败，状态码: {response.status_code}, 响应: {response.text}")
                     return False, f"API请求失败，状态码: {response.status_code}"
                     
-                response_data = response.json()
-                logger.info(f"API响应: {json.dumps(response_data, ensure_ascii=False)}")
-                
-                # 提取API返回的内容
-                if 'choices' in response_data and len(response_data['choices']) > 0:
-                    content = response_data['choices'][0]['message']['content']
-                    
-                    # 尝试解析JSON响应
-                    try:
-                        # 检查是否包含Markdown代码块标记
-                        if content.strip().startswith('```') and '```' in content.strip()[3:]:
-                            # 提取代码块中的JSON内容
-                            content_parts = content.strip().split('```')
-                            if len(content_parts) >= 3:
-                                # 提取中间部分（JSON内容）
-                                json_content = content_parts[1]
-                                # 如果以'json'开头，去掉它
-                                if json_content.startswith('json'):
-                                    json_content = json_content[4:].strip()
-                                else:
-                                    json_content = json_content.strip()
-                                # 尝试解析提取的JSON
-                                result = json.loads(json_content)
-                            else:
-                                # 如果分割后的部分不足3个，尝试直接解析
-                                result = json.loads(content)
-                        else:
-                            # 没有Markdown标记，直接解析
-                            result = json.loads(content)
-                        
-                        # 处理返回数组的情况
-                        if isinstance(result, list) and len(result) > 0:
-                            # 如果返回的是数组，取第一个元素
-                            result = result[0]
-                        
-                        # 验证返回的JSON是否包含必要的字段
-                        if all(key in result for key in ['content_0', 'wrong', 'annotation', 'content_1']):
-                            return True, result
-                        else:
-                            logger.error(f"API返回的JSON格式不符合预期: {content}")
-                            return False, f"API返回的JSON格式不符合预期: {content}"
-                    except json.JSONDecodeError as e:
-                        logger.error(f"API返回的内容不是有效的JSON: {content}, 错误: {str(e)}")
-                        return False, f"API返回的内容不是有效的JSON: {content}"
-                else:
-                    logger.error(f"API响应中没有找到有效内容: {response_data}")
-                    return False, f"API响应中没有找到有效内容"
+                response_data = loads(response.content)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"API响应大小: {len(response.content)} 字节")
+                return True, response_data
                     
             except (Timeout, ConnectionError) as e:
                 # 超时或连接错误，进行重试
@@ -194,13 +424,315 @@ class ApiClient:
             except Exception as e:
                 logger.error(f"校对句子时发生错误: {str(e)}")
                 return False, f"校对句子时发生错误: {str(e)}"
-                
-            # 如果执行到这里，说明请求成功，跳出重试循环
-            break
             
         # 如果所有重试都失败，返回错误
         return False, "所有API请求尝试均失败"
-
+        
+    async def _post_async(self, session, payload):
+        """
+        异步发送请求，超时、连接错误或限流时重试
+        
+        Args:
+            session: 异步HTTP会话
+            payload: 已序列化的请求体
+            
+        Returns:
+            tuple: (是否成功, 已解析的API响应或错误信息, 本次请求是否遇到限流)
+        """
+        # 设置重试参数
+        max_retries = 3  # 最大重试次数
+        retry_delay = 2  # 重试间隔（秒）
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"发送API请求: {payload.decode('utf-8')}")
+        
+        # 本次请求（含重试）是否收到过限流响应(429)
+        rate_limited = False
+        
+        # 实现重试机制
+        for retry in range(max_retries):
+            try:
+                async with session.post(self.api_url, data=payload) as response:
+                    body = await response.read()
+                    if response.status == 429:
+                        rate_limited = True
+                    
+                    if response.status in RETRY_STATUS_CODES and retry + 1 < max_retries:
+                        logger.warning(f"API请求返回状态码 {response.status}，正在进行第{retry + 1}次重试")
+                        await asyncio.sleep(retry_delay * (retry + 1))
+                        continue
+                        
+                    if response.status != 200:
+                        logger.error(f"API请求失败，状态码: {response.status}, 响应: {body.decode('utf-8', 'replace')}")
+                        return False, f"API请求失败，状态码: {response.status}", rate_limited
+                        
+                response_data = loads(body)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"API响应大小: {len(body)} 字节")
+                return True, response_data, rate_limited
+                
+            except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as e:
+                # 超时或连接错误，进行重试
+                retry_count = retry + 1
+                if retry_count < max_retries:
+                    logger.warning(f"API请求超时或连接错误，正在进行第{retry_count}次重试: {str(e)}")
+                    await asyncio.sleep(retry_delay * (retry + 1))  # 指数退避策略
+                    continue
+                else:
+                    logger.error(f"API请求失败，已重试{max_retries}次: {str(e)}")
+                    return False, f"API请求失败，已重试{max_retries}次: {str(e)}", rate_limited
+            
+            except Exception as e:
+                logger.error(f"校对句子时发生错误: {str(e)}")
+                return False, f"校对句子时发生错误: {str(e)}", rate_limited
+            
+        # 如果所有重试都失败，返回错误
+        return False, "所有API请求尝试均失败", rate_limited
+        
+    def _extract_content(self, response_data):
+        """
+        提取API响应中模型返回的JSON内容
+        
+        Args:
+            response_data: 已解析的API响应
+            
+        Returns:
+            tuple: (模型返回的原始文本, 解析后的JSON)，没有有效内容时返回 (None, None)
+            
+        Raises:
+            JSONDecodeError: 模型返回的内容不是有效的JSON
+        """
+        if not ('choices' in response_data and len(response_data['choices']) > 0):
+            return None, None
+            
+        content = response_data['choices'][0]['message']['content']
+        
+        # 如果包含Markdown代码块标记，只解析第一个代码块中的JSON内容
+        match = _CODE_BLOCK_RE.match(content)
+        return content, loads(match.group(1) if match else content)
+        
+    def _parse_response_data(self, response_data):
+        """
+        解析API响应数据，提取校对结果
+        
+        Args:
+            response_data: 已解析的API响应
+            
+        Returns:
+            tuple: (是否成功, 校对结果或错误信息)
+        """
+        try:
+            content, result = self._extract_content(response_data)
+        except JSONDecodeError as e:
+            content = response_data['choices'][0]['message']['content']
+            logger.error(f"API返回的内容不是有效的JSON: {content}, 错误: {str(e)}")
+            return False, f"API返回的内容不是有效的JSON: {content}"
+        except (KeyError, IndexError, TypeError) as e:
+            # 响应结构不完整，如缺少 message 或 content 为 null
+            logger.error(f"API响应格式不符合预期: {response_data}, 错误: {str(e)}")
+            return False, f"API响应格式不符合预期: {str(e)}"
+            
+        if content is None:
+            logger.error(f"API响应中没有找到有效内容: {response_data}")
+            return False, f"API响应中没有找到有效内容"
+            
+        # 处理返回数组的情况
+        if isinstance(result, list) and len(result) > 0:
+            # 如果返回的是数组，取第一个元素
+            result = result[0]
+        
+        # 验证返回的JSON是否包含必要的字段
+        if isinstance(result, dict) and _REQUIRED_KEYS <= result.keys():
+            return True, result
+        else:
+            logger.error(f"API返回的JSON格式不符合预期: {content}")
+            return False, f"API返回的JSON格式不符合预期: {content}"
+            
+    def _parse_batch_response_data(self, response_data, count):
+        """
+        解析批量校对的API响应数据
+        
+        Args:
+            response_data: 已解析的API响应
+            count: 请求中的句子数量
+            
+        Returns:
+            list: 与请求句子顺序一致的校对结果列表，格式不符或数量不一致时返回None
+        """
+        try:
+            content, result = self._extract_content(response_data)
+        except JSONDecodeError as e:
+            logger.warning(f"批量校对返回的内容不是有效的JSON，改为逐句校对: {str(e)}")
+            return None
+        except (KeyError, IndexError, TypeError) as e:
+            logger.warning(f"批量校对的API响应格式不符合预期，改为逐句校对: {str(e)}")
+            return None
+            
+        results = result.get('results') if isinstance(result, dict) else result
+        if not isinstance(results, list) or len(results) != count:
+            logger.warning(f"批量校对返回的结果数量与句子数量不一致，改为逐句校对: {content}")
+            return None
+            
+        for item in results:
+            if not (isinstance(item, dict) and _REQUIRED_KEYS <= item.keys()):
+                logger.warning(f"批量校对返回的JSON格式不符合预期，改为逐句校对: {content}")
+                return None
+                
+        return results
+    
+    def proofread_sentence(self, sentence):
+        """
+        发送句子到API进行校对
+        
+        Args:
+            sentence: 需要校对的句子
+            
+        Returns:
+            tuple: (是否成功, 校对结果或错误信息)
+        """
+        if not sentence.strip():
+            return False, "句子为空，跳过校对"
+            
+        # 优先使用缓存的校对结果
+        cached = self._cache_get(sentence)
+        if cached is not None:
+            logger.debug(f"命中校对缓存: {sentence}")
+            return cached
+            
+        ok, response_data = self._post(self._build_request_payload(sentence))
+        if not ok:
+            return False, response_data
+            
+        success, result = self._parse_response_data(response_data)
+        self._cache_put(sentence, success, result)
+        return success, result
+    
+    def _prepare_batch(self, sentences):
+        """
+        批量校对前处理空句子和缓存命中的句子，缓存中的失败结果重新请求API
+        
+        Args:
+            sentences: 需要校对的句子列表
+            
+        Returns:
+            tuple: (结果列表, 仍需请求API的句子索引列表)
+        """
+        results = [None] * len(sentences)
+        pending = []
+        
+        for index, sentence in enumerate(sentences):
+            if not sentence.strip():
+                results[index] = (False, "句子为空，跳过校对")
+                continue
+                
+            cached = self._cache_get(sentence, include_failures=False)
+            if cached is not None:
+                logger.debug(f"命中校对缓存: {sentence}")
+                results[index] = cached
+            else:
+                pending.append(index)
+                
+        return results, pending
+    
+    def _store_batch_results(self, sentences, pending, batch_results, results):
+        """
+        将批量校对结果写回结果列表并缓存
+        
+        Args:
+            sentences: 需要校对的句子列表
+            pending: 请求API的句子索引列表
+            batch_results: API返回的校对结果列表
+            results: 需要填充的结果列表
+        """
+        for index, result in zip(pending, batch_results):
+            self._cache_put(sentences[index], True, result)
+            results[index] = (True, result)
+    
+    def create_async_session(self, concurrency=8):
+        """
+        创建异步HTTP会话，连接池大小与并发数一致
+        
+        Args:
+            concurrency: 最大并发请求数
+            
+        Returns:
+            aiohttp.ClientSession: 异步会话，需由调用方关闭
+        """
+        connector = aiohttp.TCPConnector(limit=concurrency, keepalive_timeout=60)
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {self.api_key}"
+            },
+            timeout=aiohttp.ClientTimeout(total=60, sock_connect=5)
+        )
+    
+    async def proofread_sentence_async(self, session, sentence):
+        """
+        异步发送句子到API进行校对
+        
+        Args:
+            session: 异步HTTP会话
+            sentence: 需要校对的句子
+            
+        Returns:
+            tuple: ((是否成功, 校对结果或错误信息), 本次请求是否遇到限流)
+        """
+        if not sentence.strip():
+            return (False, "句子为空，跳过校对"), False
+            
+        # 优先使用缓存的成功结果，失败结果重新请求
+        cached = self._cache_get(sentence, include_failures=False)
+        if cached is not None:
+            logger.debug(f"命中校对缓存: {sentence}")
+            return cached, False
+            
+        ok, response_data, rate_limited = await self._post_async(session, self._build_request_payload(sentence))
+        if not ok:
+            return (False, response_data), rate_limited
+            
+        success, result = self._parse_response_data(response_data)
+        self._cache_put(sentence, success, result)
+        return (success, result), rate_limited
+    
+    async def proofread_batch_async(self, session, sentences):
+        """
+        异步在一次API请求中校对多个句子，返回格式不符时逐句校对
+        
+        Args:
+            session: 异步HTTP会话
+            sentences: 需要校对的句子列表
+            
+        Returns:
+            tuple: (与输入顺序一致的 (是否成功, 校对结果或错误信息) 列表, 本批请求是否遇到限流)；
+                   请求失败时所有待校对句子都返回该错误
+        """
+        results, pending = self._prepare_batch(sentences)
+        rate_limited = False
+        
+        if len(pending) == 1:
+            index = pending[0]
+            results[index], rate_limited = await self.proofread_sentence_async(session, sentences[index])
+        elif pending:
+            batch = [sentences[index] for index in pending]
+            ok, response_data, rate_limited = await self._post_async(session, self._build_batch_payload(batch))
+            
+            if not ok:
+                # 请求本身失败（限流、认证错误、超时等），逐句重试只会放大失败，直接返回错误
+                for index in pending:
+                    results[index] = (False, response_data)
+                return results, rate_limited
+                
+            batch_results = self._parse_batch_response_data(response_data, len(batch))
+            if batch_results is None:
+                for index in pending:
+                    results[index], sentence_rate_limited = await self.proofread_sentence_async(session, sentences[index])
+                    rate_limited = rate_limited or sentence_rate_limited
+            else:
+                self._store_batch_results(sentences, pending, batch_results, results)
+                
+        return results, rate_limited
 
 # 测试代码
 if __name__ == "__main__":
@@ -6,12 +6,11 @@
 负责管理API配置信息的保存和读取
 """
 
-import json
 import os
 import logging
 
-# 配置日志
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+from src._json import loads, dumpb
+
 logger = logging.getLogger(__name__)
 
 class ConfigManager:
@@ -36,6 +35,9 @@ class ConfigManager:
             'api_url': 'https://api.deepseek.com/chat/completions',
             'model': 'deepseek-chat',
             'api_key': '',
+            'batch_size': 8,  # 每个API请求中包含的句子数
+            'concurrency': 8,  # 同时进行的API请求数（初始值，运行中自动调整）
+            'requests_per_minute': 0,  # 每分钟最大请求数，0表示不限速
             'system_prompt': """作为一个细致耐心的文字秘书，对下面的句子进行错别字检查，按如下结构以 JOSN 格式输出：
 {
 "content_0":"原始句子",
@@ -45,8 +47,26 @@ class ConfigManager:
 }"""
         }
         
-        # 当前配置
-        self.config = self.load_config()
+        # 当前配置，首次访问时才从文件加载
+        self._config = None
+        # 配置文件是否存在，首次加载时检查一次
+        self._config_exists = None
+        
+    @property
+    def config(self):
+        """
+        当前配置，首次访问时从文件加载
+        
+        Returns:
+            dict: 配置信息字典
+        """
+        if self._config is None:
+            self._config = self.load_config()
+        return self._config
+    
+    @config.setter
+    def config(self, value):
+        self._config = value
         
     def load_config(self):
         """
@@ -56,9 +76,13 @@ class ConfigManager:
             dict: 配置信息字典
         """
         try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
+            if self._config_exists is None:
+                self._config_exists = os.path.exists(self.config_file)
+                
+            if self._config_exists:
+                # 直接解析UTF-8字节，省去一次解码
+                with open(self.config_file, 'rb') as f:
+                    config = loads(f.read())
                 logger.info(f"成功从 {self.config_file} 加载配置")
                 return config
             else:
@@ -82,8 +106,9 @@ class ConfigManager:
             config = self.config
             
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=4)
+            with open(self.config_file, 'wb') as f:
+                f.write(dumpb(config, indent=True))
+            self._config_exists = True
             logger.info(f"成功保存配置到 {self.config_file}")
             return True
         except Exception as e:
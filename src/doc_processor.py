@@ -10,15 +10,141 @@ import os
 import re
 import logging
 import datetime
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import partial
+from operator import itemgetter
 from docx import Document
 from docx.shared import RGBColor
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
 
-# 配置日志
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 分句结果缓存，键为 (文档路径, 修改时间, 文件大小)；文档未修改时再次校对可跳过分句
+# 文档对象会被添加批注修改，因此只缓存分句结果，不缓存文档对象
+_SPLIT_CACHE = OrderedDict()
+_SPLIT_CACHE_SIZE = 4
+
+# 分句规则 - 中文句号使用全角句号，英文句号需要更严格的匹配条件
+SENTENCE_END_PATTERN = r'(。？！|\.[\s\n]|\?|!)["\'\'\'"]?(?=$|[\s\n])'
+
+# 分句规则能匹配的句子结束标记都以这些字符开头，文本中不含这些字符时无需运行正则
+_TERMINATOR_CHARS = frozenset('。.?!')
+
+# 文档总字数达到该值时使用编译的边界扫描代替正则（需安装numpy和numba）
+# 导入numba约0.17秒、加载已缓存的编译结果约0.13秒（首次编译约0.5秒），而扫描每千字只比正则快约10微秒，
+# 只有数千万字的超大文档才能抵消这部分开销
+NATIVE_SCAN_MIN_CHARS = 30000000
+
+# 编译的边界扫描函数，首次需要时才导入；导入失败时记为False，不再重试
+_native_sentence_ends = None
+
+
+def _load_native_sentence_ends():
+    """
+    按需导入编译的边界扫描函数
+    
+    Returns:
+        function: 扫描函数 sentence_ends(text)，未安装numpy或numba时返回None
+    """
+    global _native_sentence_ends
+    if _native_sentence_ends is None:
+        try:
+            from src._native_split import sentence_ends
+            _native_sentence_ends = sentence_ends
+        except ImportError:
+            _native_sentence_ends = False
+    return _native_sentence_ends or None
+
+
+def _sentence_ends(text, sentence_end_re, native_ends=None):
+    """
+    查找文本中所有句子结束标记之后的位置
+    
+    Args:
+        text: 段落文本
+        sentence_end_re: 句子结束标记的正则表达式
+        native_ends: 编译的边界扫描函数，为None时使用正则
+        
+    Returns:
+        list: 句子结束位置列表
+    """
+    if native_ends is not None:
+        return native_ends(text)
+        
+    ends = []
+    current_pos = 0
+    # 从当前位置查找句子结束位置，避免每次切片复制剩余文本
+    match = sentence_end_re.search(text, current_pos)
+    while match:
+        current_pos = match.end()
+        ends.append(current_pos)
+        match = sentence_end_re.search(text, current_pos)
+    return ends
+
+
+def _split_text(text, sentence_end_re, exclude_re, native_ends=None):
+    """
+    按句子结束标记切分一段文本
+    
+    Args:
+        text: 段落文本
+        sentence_end_re: 句子结束标记的正则表达式
+        exclude_re: 排除模式的正则表达式
+        native_ends: 编译的边界扫描函数，为None时使用正则
+        
+    Returns:
+        list: [(句子, 开始位置, 结束位置), ...]
+    """
+    text_len = len(text)
+    
+    # 标题等没有结束标记的文本直接作为一个句子
+    if _TERMINATOR_CHARS.isdisjoint(text):
+        sentence = text.strip()
+        return [(sentence, 0, text_len)] if sentence else []
+        
+    spans = []
+    current_pos = 0
+    for end_pos in _sentence_ends(text, sentence_end_re, native_ends):
+        sentence = text[current_pos:end_pos].strip()
+        
+        # 如果句子太短且以英文句号结尾，可能是错误分割；再检查排除模式
+        is_excluded = (len(sentence) < 5 and sentence.endswith('.')) or bool(exclude_re.search(sentence))
+        
+        if not is_excluded and sentence:
+            spans.append((sentence, current_pos, end_pos))
+            
+        current_pos = end_pos
+        
+    # 最后一个结束标记之后的剩余文本作为一个句子
+    if current_pos < text_len:
+        sentence = text[current_pos:].strip()
+        if sentence:
+            spans.append((sentence, current_pos, text_len))
+            
+    return spans
+
+
+@dataclass
+class Sentences:
+    """分句结果，各字段按句子序号对齐，可像句子列表一样取长度、遍历和按序号取句子"""
+    
+    texts: list = field(default_factory=list)  # 句子文本
+    paragraph_idx: array = field(default_factory=lambda: array('l'))  # 句子所在段落的序号（正文段落在前，表格段落在后）
+    lengths: array = field(default_factory=lambda: array('l'))  # 句子去除首尾空白后的长度
+    
+    def __len__(self):
+        return len(self.texts)
+        
+    def __iter__(self):
+        return iter(self.texts)
+        
+    def __getitem__(self, index):
+        return self.texts[index]
+
+
 class DocProcessor:
     """文档处理类，负责Word文档的读取、分句和批注"""
     
@@ -31,12 +157,14 @@ class DocProcessor:
         """
         self.file_path = file_path
         self.document = None
-        self.sentences = []
+        self.sentences = Sentences()
         self.sentence_positions = []  # 存储每个句子在文档中的位置信息
+        self.unique_sentences = {}  # 去重后的句子 -> 去重序号
+        self.sentence_to_unique = []  # 每个句子对应的去重序号
+        self._cache_key = None  # 分句结果缓存键
         
         # 分句规则 - 优化英文句号的处理
-        # 中文句号使用全角句号，英文句号需要更严格的匹配条件
-        self.sentence_end_pattern = r'(。？！|\.[\s\n]|\?|!)["\'\'\'"]?(?=$|[\s\n])'
+        self.sentence_end_pattern = SENTENCE_END_PATTERN
         
         # 排除的特殊情况
         self.exclude_patterns = [
@@ -64,6 +192,11 @@ class DocProcessor:
             r'\d+\.',  # 序号，如"1."
         ]
         
+        # 预编译正则表达式，排除模式合并为一个表达式，每个句子只需匹配一次
+        # 分句规则中的\s需要匹配全角空格(U+3000)和不换行空格等Unicode空白，保持Unicode模式
+        self._sentence_end_re = re.compile(self.sentence_end_pattern)
+        self._exclude_re = re.compile("|".join(f"(?:{p})" for p in self.exclude_patterns))
+        
     def load_document(self, file_path=None):
         """
         加载Word文档
@@ -83,139 +216,127 @@ class DocProcessor:
             
         try:
             self.document = Document(self.file_path)
+            stat = os.stat(self.file_path)
+            self._cache_key = (os.path.abspath(self.file_path), stat.st_mtime_ns, stat.st_size)
             logger.info(f"成功加载文档: {self.file_path}")
             return True
         except Exception as e:
             logger.error(f"加载文档失败: {str(e)}")
             return False
     
+    def _iter_paragraph_texts(self):
+        """
+        遍历正文中的非空段落
+        
+        Yields:
+            tuple: (段落位置信息, 段落文本)
+        """
+        for para_index, paragraph in enumerate(self.document.paragraphs):
+            # paragraph.text 每次访问都会拼接所有run，只读取一次
+            text = paragraph.text
+            if text.strip():
+                yield {'type': 'paragraph', 'paragraph_index': para_index}, text
+    
+    def _iter_table_texts(self):
+        """
+        遍历表格单元格中的非空段落
+        
+        Yields:
+            tuple: (段落位置信息, 段落文本)
+        """
+        # 将表格、行、单元格、段落的嵌套遍历展开为一个列表
+        cell_paragraphs = [
+            (table_index, row_index, cell_index, para_index, paragraph)
+            for table_index, table in enumerate(self.document.tables)
+            for row_index, row in enumerate(table.rows)
+            for cell_index, cell in enumerate(row.cells)
+            for para_index, paragraph in enumerate(cell.paragraphs)
+        ]
+        
+        for table_index, row_index, cell_index, para_index, paragraph in cell_paragraphs:
+            text = paragraph.text
+            if text.strip():
+                yield {
+                    'type': 'table',
+                    'table_index': table_index,
+                    'row_index': row_index,
+                    'cell_index': cell_index,
+                    'paragraph_index': para_index
+                }, text
+    
+    def _split_texts(self, texts):
+        """
+        对多个段落文本分句
+        
+        Args:
+            texts: 段落文本列表
+            
+        Returns:
+            list: 每个段落的 [(句子, 开始位置, 结束位置), ...] 列表
+        """
+        # 超大文档才使用编译的边界扫描，且只实现了默认分句规则
+        native_ends = None
+        if self.sentence_end_pattern == SENTENCE_END_PATTERN and sum(map(len, texts)) >= NATIVE_SCAN_MIN_CHARS:
+            native_ends = _load_native_sentence_ends()
+        split_text = partial(_split_text, sentence_end_re=self._sentence_end_re,
+                             exclude_re=self._exclude_re, native_ends=native_ends)
+        return [split_text(text) for text in texts]
+    
     def split_into_sentences(self):
         """
         将文档内容分割成句子
         
         Returns:
-            list: 句子列表
+            Sentences: 分句结果
         """
         if not self.document:
             logger.error("文档未加载")
-            return []
-            
-        self.sentences = []
-        self.sentence_positions = []
-        
-        # 遍历文档中的段落和表格
-        for para_index, paragraph in enumerate(self.document.paragraphs):
-            if not paragraph.text.strip():
-                continue
-                
-            # 处理段落中的文本
-            text = paragraph.text
-            current_pos = 0
+            return Sentences()
             
-            while current_pos < len(text):
-                # 查找句子结束位置
-                match = re.search(self.sentence_end_pattern, text[current_pos:])
-                
-                if match:
-                    end_pos = current_pos + match.end()
-                    sentence = text[current_pos:end_pos].strip()
-                    
-                    # 检查是否是排除的特殊情况
-                    is_excluded = False
+        cached = _SPLIT_CACHE.get(self._cache_key) if self._cache_key else None
+        if cached is not None:
+            _SPLIT_CACHE.move_to_end(self._cache_key)
+            positions, self.sentences = cached
+            self.sentence_positions = list(positions)
+            logger.info(f"文档未修改，使用缓存的分句结果，共 {len(self.sentence_positions)} 个句子")
+        else:
+            # 先处理段落中的文本，再处理表格中的文本
+            entries = [*self._iter_paragraph_texts(), *self._iter_table_texts()]
+            spans_list = self._split_texts([text for _, text in entries])
+            self.sentence_positions = []
+            paragraph_idx = array('l')
+            for paragraph_ordinal, ((base, _), spans) in enumerate(zip(entries, spans_list)):
+                for sentence, start, end in spans:
+                    self.sentence_positions.append({**base, 'start': start, 'end': end, 'text': sentence})
+                    paragraph_idx.append(paragraph_ordinal)
                     
-                    # 如果句子太短且以英文句号结尾，可能是错误分割
-                    if len(sentence) < 5 and sentence.endswith('.'):
-                        is_excluded = True
+            texts = [position['text'] for position in self.sentence_positions]
+            self.sentences = Sentences(texts, paragraph_idx, array('l', [len(text) for text in texts]))
+            
+            if self._cache_key:
+                _SPLIT_CACHE[self._cache_key] = (tuple(self.sentence_positions), self.sentences)
+                if len(_SPLIT_CACHE) > _SPLIT_CACHE_SIZE:
+                    _SPLIT_CACHE.popitem(last=False)
                     
-                    # 检查排除模式
-                    for pattern in self.exclude_patterns:
-                        if re.search(pattern, sentence):
-                            is_excluded = True
-                            break
-                                
-                    if not is_excluded and sentence:
-                        self.sentences.append(sentence)
-                        # 存储句子位置信息
-                        self.sentence_positions.append({
-                            'type': 'paragraph',
-                            'paragraph_index': para_index,
-                            'start': current_pos,
-                            'end': end_pos,
-                            'text': sentence
-                        })
-                        
-                    current_pos = end_pos
-                else:
-                    # 如果没有找到句子结束标记，将剩余文本作为一个句子
-                    sentence = text[current_pos:].strip()
-                    if sentence:
-                        self.sentences.append(sentence)
-                        self.sentence_positions.append({
-                            'type': 'paragraph',
-                            'paragraph_index': para_index,
-                            'start': current_pos,
-                            'end': len(text),
-                            'text': sentence
-                        })
-                    break
-        
-        # 处理表格中的文本
-        for table_index, table in enumerate(self.document.tables):
-            for row_index, row in enumerate(table.rows):
-                for cell_index, cell in enumerate(row.cells):
-                    for para_index, paragraph in enumerate(cell.paragraphs):
-                        if not paragraph.text.strip():
-                            continue
-                            
-                        text = paragraph.text
-                        current_pos = 0
-                        
-                        while current_pos < len(text):
-                            match = re.search(self.sentence_end_pattern, text[current_pos:])
-                            
-                            if match:
-                                end_pos = current_pos + match.end()
-                                sentence = text[current_pos:end_pos].strip()
-                                
-                                is_excluded = False
-                                for pattern in self.exclude_patterns:
-                                    if re.search(pattern, sentence):
-                                        is_excluded = True
-                                        break
-                                        
-                                if not is_excluded and sentence:
-                                    self.sentences.append(sentence)
-                                    self.sentence_positions.append({
-                                        'type': 'table',
-                                        'table_index': table_index,
-                                        'row_index': row_index,
-                                        'cell_index': cell_index,
-                                        'paragraph_index': para_index,
-                                        'start': current_pos,
-                                        'end': end_pos,
-                                        'text': sentence
-                                    })
-                                    
-                                current_pos = end_pos
-                            else:
-                                sentence = text[current_pos:].strip()
-                                if sentence:
-                                    self.sentences.append(sentence)
-                                    self.sentence_positions.append({
-                                        'type': 'table',
-                                        'table_index': table_index,
-                                        'row_index': row_index,
-                                        'cell_index': cell_index,
-                                        'paragraph_index': para_index,
-                                        'start': current_pos,
-                                        'end': len(text),
-                                        'text': sentence
-                                    })
-                                break
-        
-        logger.info(f"文档分句完成，共 {len(self.sentences)} 个句子")
+            logger.info(f"文档分句完成，共 {len(self.sentence_positions)} 个句子")
+            
+        self._index_unique_sentences()
         return self.sentences
     
+    def _index_unique_sentences(self):
+        """
+        为句子去重，重复出现的句子（页眉、表头、固定说明等）只需校对一次
+        """
+        self.unique_sentences = {}
+        self.sentence_to_unique = []
+        
+        for sentence in self.sentences:
+            unique_index = self.unique_sentences.setdefault(sentence, len(self.unique_sentences))
+            self.sentence_to_unique.append(unique_index)
+            
+        if len(self.unique_sentences) < len(self.sentences):
+            logger.info(f"去除重复句子后需校对 {len(self.unique_sentences)} 个句子")
+    
     def add_comment(self, sentence_index, comment_text):
         """
         为指定句子添加批注
@@ -233,18 +354,8 @@ class DocProcessor:
             
         try:
             position = self.sentence_positions[sentence_index]
-            
-            if position['type'] == 'paragraph':
-                # 为段落中的句子添加批注
-                paragraph = self.document.paragraphs[position['paragraph_index']]
-                self._add_comment_to_paragraph(paragraph, position['start'], position['end'], comment_text)
-                
-            elif position['type'] == 'table':
-                # 为表格中的句子添加批注
-                table = self.document.tables[position['table_index']]
-                cell = table.rows[position['row_index']].cells[position['cell_index']]
-                paragraph = cell.paragraphs[position['paragraph_index']]
-                self._add_comment_to_paragraph(paragraph, position['start'], position['end'], comment_text)
+            paragraph = self._get_paragraph(position)
+            self._add_comment_to_paragraph(paragraph, position['start'], position['end'], comment_text)
                 
             logger.info(f"成功为句子添加批注: {self.sentences[sentence_index]}")
             return True
@@ -253,6 +364,61 @@ class DocProcessor:
             logger.error(f"添加批注失败: {str(e)}")
             return False
     
+    def add_comments_bulk(self, comments):
+        """
+        批量为句子添加批注，按句子顺序一次遍历，同一段落只定位一次
+        
+        Args:
+            comments: (句子索引, 批注内容) 列表
+            
+        Returns:
+            int: 成功添加的批注数量
+        """
+        if not self.document:
+            logger.error("文档未加载")
+            return 0
+            
+        added = 0
+        paragraph = None
+        paragraph_key = None
+        paragraph_idx = self.sentences.paragraph_idx
+        for sentence_index, comment_text in sorted(comments, key=itemgetter(0)):
+            if sentence_index >= len(self.sentence_positions):
+                logger.error(f"句子索引无效: {sentence_index}")
+                continue
+                
+            try:
+                position = self.sentence_positions[sentence_index]
+                # 句子按文档顺序排列，同一段落的句子相邻，段落对象可直接复用
+                key = paragraph_idx[sentence_index]
+                if key != paragraph_key:
+                    paragraph = self._get_paragraph(position)
+                    paragraph_key = key
+                if self._add_comment_to_paragraph(paragraph, position['start'], position['end'], comment_text):
+                    added += 1
+            except Exception as e:
+                logger.error(f"添加批注失败: {str(e)}")
+                
+        logger.info(f"批量添加批注完成，共 {added} 条")
+        return added
+    
+    def _get_paragraph(self, position):
+        """
+        根据句子位置信息获取所在段落
+        
+        Args:
+            position: 句子位置信息
+            
+        Returns:
+            paragraph: 段落对象
+        """
+        if position['type'] == 'table':
+            # 表格中的句子
+            table = self.document.tables[position['table_index']]
+            cell = table.rows[position['row_index']].cells[position['cell_index']]
+            return cell.paragraphs[position['paragraph_index']]
+        return self.document.paragraphs[position['paragraph_index']]
+    
     def _add_comment_to_paragraph(self, paragraph, start, end, comment_text):
         """
         为段落中的特定文本添加批注
@@ -264,16 +430,7 @@ class DocProcessor:
             comment_text: 批注内容
         """
         try:
-            # 保存原始文本
-            text = paragraph.text
-            
-            # 清除原段落中的所有运行
-            for run in paragraph.runs:
-                run._element.getparent().remove(run._element)
-            
-            # 添加原文内容
-            paragraph.add_run(text)
-            
+            # 原有的运行保持不变以保留原文格式，只在段落末尾追加批注
             # 添加空格分隔符
             paragraph.add_run(' ')
             
@@ -283,7 +440,7 @@ class DocProcessor:
             comment_run.font.bold = True  # 加粗
             comment_run.font.italic = True  # 斜体
             
-            logger.info(f"成功为文本添加批注: {text}")
+            logger.debug(f"成功为文本添加批注: {comment_text}")
             return True
         except Exception as e:
             logger.error(f"添加批注到段落时出错: {str(e)}")
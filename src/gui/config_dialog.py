@@ -11,12 +11,45 @@ import logging
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, 
                              QLineEdit, QTextEdit, QPushButton, QMessageBox, QApplication)
 from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QFont, QIcon, QColor, QPalette
 
-# 配置日志
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+from src.gui.styles import APP_QSS, compact_qss
+
 logger = logging.getLogger(__name__)
 
+# 对话框特有的样式，通用样式见 src.gui.styles.APP_QSS
+_CONFIG_QSS = compact_qss("""
+    QLabel {
+        padding-right: 10px;
+    }
+    QLineEdit {
+        border: 1px solid #DADCE0;
+        border-radius: 4px;
+        padding: 6px 8px;
+        background-color: #FFFFFF;
+        color: #202124;
+        font-size: 14px;
+        min-width: 360px;
+    }
+    QLineEdit:focus, QTextEdit:focus {
+        border: 2px solid #1A73E8;
+    }
+    QPushButton {
+        padding: 6px 14px;
+        margin: 0 3px;
+    }
+    QPushButton#test_button {
+        background-color: #34A853;  /* 绿色按钮 */
+        color: white;
+        border: none;
+    }
+    QPushButton#test_button:hover {
+        background-color: #2E8B57;  /* 悬停时的颜色 */
+    }
+    QPushButton#test_button:pressed {
+        background-color: #228B22;  /* 按下时的颜色 */
+    }
+""")
+
 class ConfigDialog(QDialog):
     """配置对话框类，负责API配置界面的展示和交互"""
     
@@ -32,10 +65,43 @@ class ConfigDialog(QDialog):
             parent: 父窗口
         """
         super().__init__(parent)
+        # 界面在首次显示时才构建，未打开的对话框不产生控件和样式开销
+        self._built = False
+        self.reset(config)
+        
+    def reset(self, config=None):
+        """
+        使用新的配置重置对话框，界面已构建时直接回填输入框
+        
+        Args:
+            config: 当前配置信息
+        """
         self.config = config or {}
-        self.initUI()
+        # 最近一次保存的配置项，未修改时保存不再发送更新信号
+        self._last_emitted = (
+            self.config.get('api_url', ''),
+            self.config.get('model', ''),
+            self.config.get('api_key', '')
+        )
+        self.system_prompt = self.config.get('system_prompt', '')
+        if self._built:
+            self.api_url_edit.setText(self._last_emitted[0])
+            self.model_edit.setText(self._last_emitted[1])
+            self.api_key_edit.setText(self._last_emitted[2])
+        
+    def showEvent(self, event):
+        """
+        对话框显示事件处理，首次显示时构建界面
+        
+        Args:
+            event: 显示事件
+        """
+        if not self._built:
+            self._build_ui()
+            self._built = True
+        super().showEvent(event)
         
-    def initUI(self):
+    def _build_ui(self):
         """初始化用户界面"""
         # 设置窗口标题和大小
         self.setWindowTitle('API配置')
@@ -73,9 +139,6 @@ class ConfigDialog(QDialog):
         self.api_key_edit.setFixedHeight(28)  # 减小输入框高度
         form_layout.addRow('API Key:', self.api_key_edit)
         
-        # 保存System Prompt值，但不显示输入框
-        self.system_prompt = self.config.get('system_prompt', '')
-        
         # 添加表单布局到主布局
         main_layout.addLayout(form_layout)
         
@@ -130,120 +193,93 @@ class ConfigDialog(QDialog):
         self.setLayout(main_layout)
         
         # 设置样式
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #FFFFFF;
-            }
-            QLabel {
-                font-size: 14px;
-                color: #202124;
-                padding-right: 10px;
-            }
-            QLineEdit {
-                border: 1px solid #DADCE0;
-                border-radius: 4px;
-                padding: 6px 8px;
-                background-color: #FFFFFF;
-                color: #202124;
-                font-size: 14px;
-                min-width: 360px;
-            }
-            QLineEdit:focus, QTextEdit:focus {
-                border: 2px solid #1A73E8;
-            }
-            QPushButton {
-                background-color: #1A73E8;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 6px 14px;
-                font-size: 14px;
-                min-width: 80px;
-                margin: 0 3px;
-            }
-            QPushButton:hover {
-                background-color: #1967D2;
-            }
-            QPushButton:pressed {
-                background-color: #185ABC;
-            }
-            QPushButton#test_button {
-                background-color: #34A853;  /* 绿色按钮 */
-                color: white;
-                border: none;
-            }
-            QPushButton#test_button:hover {
-                background-color: #2E8B57;  /* 悬停时的颜色 */
-            }
-            QPushButton#test_button:pressed {
-                background-color: #228B22;  /* 按下时的颜色 */
-            }
-            QPushButton#cancel_button {
-                background-color: #FFFFFF;
-                color: #1A73E8;
-                border: 1px solid #DADCE0;
-            }
-            QPushButton#cancel_button:hover {
-                background-color: #F1F3F4;
-            }
-        """)
+        self.setStyleSheet(_CONFIG_QSS)
         
         # 设置按钮ID以便应用样式
         self.cancel_button.setObjectName("cancel_button")
         
-    def get_config(self):
+    def _collect(self):
         """
-        获取当前配置
+        读取输入框中的配置项
         
         Returns:
-            dict: 当前配置信息
+            tuple: (api_url, model, api_key)，均已去除首尾空白
+        """
+        return (
+            self.api_url_edit.text().strip(),
+            self.model_edit.text().strip(),
+            self.api_key_edit.text().strip()
+        )
+        
+    def _build_config(self, api_url, model, api_key):
+        """
+        构建配置字典
+        
+        Args:
+            api_url: API地址
+            model: 模型名称
+            api_key: API密钥
+            
+        Returns:
+            dict: 配置信息
         """
         return {
-            'api_url': self.api_url_edit.text().strip(),
-            'model': self.model_edit.text().strip(),
-            'api_key': self.api_key_edit.text().strip(),
+            'api_url': api_url,
+            'model': model,
+            'api_key': api_key,
             'system_prompt': self.system_prompt  # 使用保存的system_prompt值
         }
         
+    def get_config(self):
+        """
+        获取当前配置
+        
+        Returns:
+            dict: 当前配置信息
+        """
+        return self._build_config(*self._collect())
+        
     def save_config(self):
         """保存配置"""
-        config = self.get_config()
+        api_url, model, api_key = values = self._collect()
         
         # 验证配置
-        if not config['api_url']:
+        if not api_url:
             QMessageBox.warning(self, '配置错误', 'API URL不能为空')
             return
             
-        if not config['model']:
+        if not model:
             QMessageBox.warning(self, '配置错误', '模型名称不能为空')
             return
             
-        if not config['api_key']:
+        if not api_key:
             QMessageBox.warning(self, '配置错误', 'API Key不能为空')
             return
             
-        # 发送配置更新信号
-        self.configUpdated.emit(config)
+        # 配置有变化时才发送配置更新信号，避免父窗口重复保存和刷新
+        if values != self._last_emitted:
+            self._last_emitted = values
+            self.configUpdated.emit(self._build_config(api_url, model, api_key))
         
         # 关闭对话框
         self.accept()
         
     def test_connection(self):
         """测试API连接"""
-        config = self.get_config()
+        api_url, model, api_key = self._collect()
         
         # 验证配置
-        if not config['api_url'] or not config['model'] or not config['api_key']:
+        if not api_url or not model or not api_key:
             QMessageBox.warning(self, '配置错误', '请填写完整的API配置信息')
             return
             
         # 通知父窗口测试连接
-        self.parent().test_api_connection(config)
-
+        self.parent().test_api_connection(self._build_config(api_url, model, api_key))
 
 # 测试代码
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    app.setStyleSheet(APP_QSS)
     
     # 测试配置
     test_config = {
@@ -10,14 +10,36 @@ import sys
 import os
 import logging
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
-                            QPushButton, QRadioButton, QButtonGroup,
+                            QPushButton, QRadioButton,
                             QFileDialog, QApplication)
 from PyQt5.QtCore import Qt, pyqtSignal
 
-# 配置日志
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+from src.gui.styles import APP_QSS, compact_qss
+
 logger = logging.getLogger(__name__)
 
+# 对话框特有的样式，通用样式见 src.gui.styles.APP_QSS
+_EXPORT_QSS = compact_qss("""
+    QRadioButton {
+        font-size: 14px;
+        color: #202124;
+        spacing: 8px;
+    }
+    QRadioButton::indicator {
+        width: 16px;
+        height: 16px;
+    }
+    QRadioButton::indicator:checked {
+        background-color: #1A73E8;
+        border: 2px solid #1A73E8;
+        border-radius: 8px;
+    }
+    QRadioButton::indicator:unchecked {
+        border: 2px solid #5F6368;
+        border-radius: 8px;
+    }
+""")
+
 class ExportDialog(QDialog):
     """导出对话框类，负责日志导出界面的展示和交互"""
     
@@ -33,10 +55,40 @@ class ExportDialog(QDialog):
             parent: 父窗口
         """
         super().__init__(parent)
+        # 界面在首次显示时才构建，未打开的对话框不产生控件和样式开销
+        self._built = False
+        self.reset(default_path)
+        
+    def reset(self, default_path=None):
+        """
+        使用新的默认路径重置对话框，界面已构建时恢复默认选项
+        
+        Args:
+            default_path: 默认导出路径
+        """
         self.default_path = default_path
-        self.initUI()
+        # 预先计算两种导出方式的默认文件路径
+        self._default_dir = os.path.dirname(default_path) if default_path else ""
+        self._default_paths = {
+            False: os.path.join(self._default_dir, "校对日志_全部.txt"),
+            True: os.path.join(self._default_dir, "校对日志_错误.txt")
+        }
+        if self._built:
+            self.all_radio.setChecked(True)
+        
+    def showEvent(self, event):
+        """
+        对话框显示事件处理，首次显示时构建界面
+        
+        Args:
+            event: 显示事件
+        """
+        if not self._built:
+            self._build_ui()
+            self._built = True
+        super().showEvent(event)
         
-    def initUI(self):
+    def _build_ui(self):
         """初始化用户界面"""
         # 设置窗口标题和大小
         self.setWindowTitle('导出校对日志')
@@ -52,19 +104,15 @@ class ExportDialog(QDialog):
         title_label.setStyleSheet('font-size: 16px; font-weight: bold; margin-bottom: 10px;')
         main_layout.addWidget(title_label)
         
-        # 创建单选按钮组
-        self.radio_group = QButtonGroup(self)
-        
+        # 单选按钮位于同一父控件中，默认互斥，无需按钮组
         # 导出全部日志选项
         self.all_radio = QRadioButton('导出全部日志')
         self.all_radio.setChecked(True)
         main_layout.addWidget(self.all_radio)
-        self.radio_group.addButton(self.all_radio, 1)
         
         # 仅导出错误日志选项
         self.errors_radio = QRadioButton('仅导出错误日志')
         main_layout.addWidget(self.errors_radio)
-        self.radio_group.addButton(self.errors_radio, 2)
         
         # 添加间隔
         main_layout.addSpacing(20)
@@ -92,70 +140,16 @@ class ExportDialog(QDialog):
         self.setLayout(main_layout)
         
         # 设置样式
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #FFFFFF;
-            }
-            QLabel {
-                color: #202124;
-            }
-            QRadioButton {
-                font-size: 14px;
-                color: #202124;
-                spacing: 8px;
-            }
-            QRadioButton::indicator {
-                width: 16px;
-                height: 16px;
-            }
-            QRadioButton::indicator:checked {
-                background-color: #1A73E8;
-                border: 2px solid #1A73E8;
-                border-radius: 8px;
-            }
-            QRadioButton::indicator:unchecked {
-                border: 2px solid #5F6368;
-                border-radius: 8px;
-            }
-            QPushButton {
-                background-color: #1A73E8;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 8px 16px;
-                font-size: 14px;
-                min-width: 80px;
-            }
-            QPushButton:hover {
-                background-color: #1967D2;
-            }
-            QPushButton:pressed {
-                background-color: #185ABC;
-            }
-            QPushButton#cancel_button {
-                background-color: #FFFFFF;
-                color: #1A73E8;
-                border: 1px solid #DADCE0;
-            }
-            QPushButton#cancel_button:hover {
-                background-color: #F1F3F4;
-            }
-        """)
+        self.setStyleSheet(_EXPORT_QSS)
         
         # 设置按钮ID以便应用样式
         self.cancel_button.setObjectName("cancel_button")
         
     def export_logs(self):
         """导出日志"""
-        # 确定是否只导出错误日志
+        # 确定是否只导出错误日志及对应的默认路径
         only_errors = self.errors_radio.isChecked()
-        
-        # 确定默认文件名
-        default_name = "校对日志_全部.txt" if not only_errors else "校对日志_错误.txt"
-        
-        # 确定默认路径
-        default_dir = os.path.dirname(self.default_path) if self.default_path else ""
-        default_path = os.path.join(default_dir, default_name)
+        default_path = self._default_paths[only_errors]
         
         # 打开文件保存对话框
         file_path, _ = QFileDialog.getSaveFileName(
@@ -174,6 +168,7 @@ class ExportDialog(QDialog):
 # 测试代码
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    app.setStyleSheet(APP_QSS)
     
     dialog = ExportDialog("C:/test/document.docx")
     
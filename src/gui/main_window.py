@@ -8,28 +8,37 @@
 
 import sys
 import os
+import asyncio
 import logging
 import threading
-import time
 import subprocess
 from PyQt5.QtWidgets import (QMainWindow, QVBoxLayout, QHBoxLayout, QLabel, 
                             QPushButton, QFileDialog, QWidget, QTextEdit,
                             QProgressBar, QMessageBox, QApplication,
                             QDialogButtonBox)
-from PyQt5.QtCore import Qt, pyqtSignal, QThread, pyqtSlot
+from PyQt5.QtCore import Qt, pyqtSignal, QThread, pyqtSlot, QTimer
 from PyQt5.QtGui import QFont, QIcon, QTextCursor
 
 from src.gui.config_dialog import ConfigDialog
 from src.gui.export_dialog import ExportDialog
+from src.gui.styles import APP_QSS
 from src.config_manager import ConfigManager
 from src.api_client import ApiClient
 from src.doc_processor import DocProcessor
 from src.log_manager import LogManager
+from src.rate_limiter import AdaptiveLimiter, TokenBucket, MAX_CONCURRENCY
 
-# 配置日志
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 校对日志刷新到界面的间隔（毫秒）
+LOG_FLUSH_INTERVAL = 100
+# 日志区域保留的最大行数，超出时丢弃最早的内容
+LOG_MAX_BLOCKS = 5000
+
+# 去除首尾空白后短于该长度的句子（空白、单个字符等）不请求API，直接记为没有错误
+MIN_SENTENCE_LENGTH = 2
+SKIPPED_RESULT = (True, {'content_0': '', 'wrong': False, 'annotation': '', 'content_1': ''})
+
 class ProofreadWorker(QThread):
     """校对工作线程，负责在后台执行校对任务"""
     
@@ -38,7 +47,7 @@ class ProofreadWorker(QThread):
     logUpdated = pyqtSignal(str)  # 日志更新
     finished = pyqtSignal(bool, str)  # 是否成功，保存路径或错误信息
     
-    def __init__(self, file_path, config, log_manager, parent=None):
+    def __init__(self, file_path, config, log_manager, api_client, parent=None):
         """
         初始化校对工作线程
         
@@ -46,20 +55,26 @@ class ProofreadWorker(QThread):
             file_path: 文档路径
             config: API配置
             log_manager: 日志管理器实例
+            api_client: API客户端实例
             parent: 父对象
         """
         super().__init__(parent)
         self.file_path = file_path
         self.config = config
         self.log_manager = log_manager  # 使用传入的日志管理器
+        self.api_client = api_client  # 与主窗口共用API客户端及其连接和缓存
         self.is_running = True
+        # 正在执行的校对任务，停止时在其事件循环中取消
+        self._task = None
+        # 待添加的批注 (句子索引, 批注内容)，校对结束后统一写入文档
+        self.pending_comments = []
         
     def run(self):
         """执行校对任务"""
         try:
             # 初始化组件
             doc_processor = DocProcessor(self.file_path)
-            api_client = ApiClient(self.config)
+            api_client = self.api_client
             # 使用传入的日志管理器而不是创建新的实例
             
             # 加载文档
@@ -76,41 +91,76 @@ class ProofreadWorker(QThread):
             # 开始记录日志
             self.log_manager.start_logging()
             
-            # 校对每个句子
+            # 所有待校对句子一次性并发提交，按完成顺序更新进度
+            # 重复出现的句子只请求一次API，结果按去重序号复用
             total = len(sentences)
-            for i, sentence in enumerate(sentences):
-                # 检查是否被停止
-                if not self.is_running:
-                    self.finished.emit(False, "校对已停止")
-                    return
-                    
-                # 更新进度
-                self.progressUpdated.emit(i + 1, total)
+            unique_texts = list(doc_processor.unique_sentences)
+            unique_results = [None] * len(unique_texts)
+            sentence_to_unique = doc_processor.sentence_to_unique
+            # 每个去重句子在文档中出现的次数，用于按完成数更新进度
+            occurrences = [0] * len(unique_texts)
+            for u in sentence_to_unique:
+                occurrences[u] += 1
+            completed = 0
+            next_index = 0
+            
+            def handle_result(u, result):
+                nonlocal completed, next_index
+                unique_results[u] = result
+                completed += occurrences[u]
                 
-                # 校对句子
-                success, result = api_client.proofread_sentence(sentence)
+                # 更新进度
+                self.progressUpdated.emit(completed, total)
                 
-                if success:
-                    # 处理校对结果
-                    if result['wrong']:
-                        # 添加批注
-                        doc_processor.add_comment(i, result['annotation'])
-                        # 记录日志
-                        log_text = self.log_manager.log_sentence(sentence, result, True)
-                    else:
-                        # 记录日志
-                        log_text = self.log_manager.log_sentence(sentence, result, False)
+                # 批注和日志按句子原顺序写入：已连续完成的句子才处理
+                while next_index < total:
+                    sentence_result = unique_results[sentence_to_unique[next_index]]
+                    if sentence_result is None:
+                        break
+                    self._handle_sentence_result(next_index, sentences[next_index], sentence_result)
+                    next_index += 1
+                    
+            # 过短的句子直接跳过
+            lengths = sentences.lengths
+            for i in range(total):
+                if lengths[i] < MIN_SENTENCE_LENGTH and unique_results[sentence_to_unique[i]] is None:
+                    handle_result(sentence_to_unique[i], SKIPPED_RESULT)
+                    
+            # 已校对过的句子直接使用缓存结果，只有其余句子需要请求API
+            pending = []
+            for u, text in enumerate(unique_texts):
+                if unique_results[u] is not None:
+                    continue
+                # 只跳过已成功校对的句子，缓存中的失败结果不会返回，这些句子重新请求API
+                cached = api_client.get_cached(text)
+                if cached is None:
+                    pending.append(u)
                 else:
-                    # 记录错误
-                    log_text = self.log_manager.log_error(sentence, result)
+                    handle_result(u, cached)
                     
-                # 发送日志更新信号
-                self.logUpdated.emit(log_text)
-                
-                # 短暂暂停，避免API请求过于频繁
-                time.sleep(0.5)
+            if pending and self.is_running:
+                # 工作线程自带事件循环，整个校对过程共用一个异步连接池
+                loop = asyncio.new_event_loop()
+                try:
+                    self._task = loop.create_task(self._proofread_all(
+                        api_client,
+                        [unique_texts[u] for u in pending],
+                        lambda index, result: handle_result(pending[index], result)
+                    ))
+                    loop.run_until_complete(self._task)
+                except asyncio.CancelledError:
+                    # 校对被停止，未完成的请求已取消
+                    pass
+                finally:
+                    self._task = None
+                    loop.close()
+            
+            if not self.is_running:
+                self.finished.emit(False, "校对已停止")
+                return
                 
-            # 保存文档
+            # 统一添加批注并保存文档
+            doc_processor.add_comments_bulk(self.pending_comments)
             success, save_path = doc_processor.save_document()
             
             if success:
@@ -125,9 +175,104 @@ class ProofreadWorker(QThread):
             logger.error(f"校对过程发生错误: {str(e)}")
             self.finished.emit(False, f"校对过程发生错误: {str(e)}")
             
+    async def _proofread_all(self, api_client, sentences, on_result):
+        """
+        并发校对所有句子，每个请求包含 batch_size 个句子
+        
+        Args:
+            api_client: API客户端
+            sentences: 需要校对的句子列表
+            on_result: 回调 on_result(序号, 结果)，按完成顺序调用
+        """
+        limiter = AdaptiveLimiter(self.config.get('concurrency', 8), MAX_CONCURRENCY)
+        # 配置了每分钟请求数时按令牌桶匀速发送请求
+        requests_per_minute = self.config.get('requests_per_minute', 0)
+        bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        batch_size = max(1, api_client.batch_size)
+        
+        async with api_client.create_async_session(MAX_CONCURRENCY) as session:
+            await asyncio.gather(
+                *(self._proofread_one(api_client, session, limiter, bucket, start,
+                                      sentences[start:start + batch_size], on_result)
+                  for start in range(0, len(sentences), batch_size))
+            )
+            
+    async def _proofread_one(self, api_client, session, limiter, bucket, start, batch, on_result):
+        """
+        在并发控制下校对一批句子，并逐句回调结果；请求出错时本批句子都回调错误信息
+        
+        Args:
+            api_client: API客户端
+            session: 异步HTTP会话
+            limiter: 自适应并发控制器
+            bucket: 令牌桶限速器，未限速时为 None
+            start: 本批第一个句子的序号
+            batch: 本批句子列表
+            on_result: 回调 on_result(序号, 结果)
+        """
+        # 已停止时不再等待并发名额和令牌
+        if not self.is_running:
+            return
+        generation = await limiter.acquire()
+        rate_limited = False
+        try:
+            if bucket is not None:
+                bucket_generation = await bucket.acquire()
+            # 已停止时不再发送新的请求
+            if not self.is_running:
+                return
+            try:
+                results, rate_limited = await api_client.proofread_batch_async(session, batch)
+            except Exception as e:
+                # 单批请求出错时记为本批句子的处理错误，不影响其他批次和文档保存
+                logger.error(f"校对句子时发生错误: {str(e)}")
+                results = [(False, f"校对句子时发生错误: {str(e)}")] * len(batch)
+            if bucket is not None:
+                bucket.record(bucket_generation, rate_limited)
+        finally:
+            await limiter.release(generation, rate_limited)
+            
+        for offset, result in enumerate(results):
+            on_result(start + offset, result)
+            
+    def _handle_sentence_result(self, index, sentence, result):
+        """
+        处理单个句子的校对结果：记录批注和日志
+        
+        Args:
+            index: 句子序号
+            sentence: 句子文本
+            result: (是否成功, 校对结果或错误信息)
+        """
+        success, result = result
+        if success:
+            # 处理校对结果
+            if result['wrong']:
+                # 记录批注，校对结束后统一添加
+                self.pending_comments.append((index, result['annotation']))
+                # 记录日志
+                log_text = self.log_manager.log_sentence(sentence, result, True)
+            else:
+                # 记录日志
+                log_text = self.log_manager.log_sentence(sentence, result, False)
+        else:
+            # 记录错误
+            log_text = self.log_manager.log_error(sentence, result)
+            
+        # 发送日志更新信号
+        self.logUpdated.emit(log_text)
+        
     def stop(self):
-        """停止校对任务"""
+        """停止校对任务，并取消尚未完成的请求"""
         self.is_running = False
+        task = self._task
+        if task is not None:
+            try:
+                # 任务属于工作线程的事件循环，需要在该循环中取消
+                task.get_loop().call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                # 事件循环已关闭，校对已经结束
+                pass
 
 
 class MainWindow(QMainWindow):
@@ -148,12 +293,24 @@ class MainWindow(QMainWindow):
         self.last_directory = os.path.join(os.path.expanduser("~"), "Desktop")
         self.worker = None
         self.is_proofreading = False
+        # 对话框首次使用时创建，之后重复使用同一实例
+        self._config_dialog = None
+        self._export_dialog = None
+        # 校对日志先写入缓冲区，由定时器批量追加到日志区域
+        self._log_buffer = []
+        # 进度条当前显示的百分比，未变化时跳过更新
+        self._last_pct = -1
         
         # 初始化界面
         self.initUI()
         
     def initUI(self):
         """初始化用户界面"""
+        # 设置应用程序级的通用样式，各对话框共用，无需各自重复解析
+        app = QApplication.instance()
+        if app is not None:
+            app.setStyleSheet(APP_QSS)
+            
         # 设置窗口标题和大小
         self.setWindowTitle('AI文档校对工具')
         self.setMinimumWidth(800)
@@ -201,8 +358,16 @@ class MainWindow(QMainWindow):
                 font-size: 14px;
             }
         """)
+        # 日志区域不需要撤销记录，并限制最大行数以控制内存和重排开销
+        self.log_text.setUndoRedoEnabled(False)
+        self.log_text.document().setMaximumBlockCount(LOG_MAX_BLOCKS)
         main_layout.addWidget(self.log_text, 1)
         
+        # 定时将缓冲区中的校对日志追加到日志区域
+        self._log_timer = QTimer(self)
+        self._log_timer.setInterval(LOG_FLUSH_INTERVAL)
+        self._log_timer.timeout.connect(self.flush_log)
+        
         # 创建进度条
         self.progress_bar = QProgressBar()
         self.progress_bar.setRange(0, 100)
@@ -249,34 +414,11 @@ class MainWindow(QMainWindow):
         # 添加底部区块到主布局
         main_layout.addLayout(bottom_layout)
         
-        # 设置样式
+        # 设置主窗口特有的样式，按钮和标签的通用样式见 APP_QSS
         self.setStyleSheet("""
             QMainWindow {
                 background-color: #F8F9FA;
             }
-            QLabel {
-                font-size: 14px;
-                color: #202124;
-            }
-            QPushButton {
-                background-color: #1A73E8;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 8px 16px;
-                font-size: 14px;
-                min-width: 80px;
-            }
-            QPushButton:hover {
-                background-color: #1967D2;
-            }
-            QPushButton:pressed {
-                background-color: #185ABC;
-            }
-            QPushButton:disabled {
-                background-color: #BDC1C6;
-                color: #FFFFFF;
-            }
             QPushButton#config_button, QPushButton#export_button {
                 background-color: #FFFFFF;
                 color: #1A73E8;
@@ -327,9 +469,12 @@ class MainWindow(QMainWindow):
             
     def show_config_dialog(self):
         """显示配置对话框"""
-        dialog = ConfigDialog(self.config_manager.get_config(), self)
-        dialog.configUpdated.connect(self.update_config)
-        dialog.exec_()
+        if self._config_dialog is None:
+            self._config_dialog = ConfigDialog(self.config_manager.get_config(), self)
+            self._config_dialog.configUpdated.connect(self.update_config)
+        else:
+            self._config_dialog.reset(self.config_manager.get_config())
+        self._config_dialog.exec_()
         
     def update_config(self, config):
         """
@@ -356,8 +501,11 @@ class MainWindow(QMainWindow):
         self.log_text.append("正在测试API连接...\n")
         QApplication.processEvents()
         
-        # 测试连接
-        connected, message = temp_client.check_connection()
+        # 测试连接，完成后关闭临时客户端的连接
+        try:
+            connected, message = temp_client.check_connection()
+        finally:
+            temp_client.close()
         
         if connected:
             QMessageBox.information(self, "连接测试", "API连接测试成功！")
@@ -394,23 +542,29 @@ class MainWindow(QMainWindow):
         self.config_button.setEnabled(False)
         self.export_button.setEnabled(False)
         self.progress_bar.setValue(0)
+        self._last_pct = 0
         
         # 创建并启动校对线程
-        # 将主窗口的日志管理器传给校对线程
-        self.worker = ProofreadWorker(self.file_path, self.config_manager.get_config(), self.log_manager)
-        self.worker.progressUpdated.connect(self.update_progress)
+        # 将主窗口的日志管理器和API客户端传给校对线程
+        self.worker = ProofreadWorker(self.file_path, self.config_manager.get_config(),
+                                      self.log_manager, self.api_client)
+        self.worker.progressUpdated.connect(self.update_progress, Qt.QueuedConnection)
         self.worker.logUpdated.connect(self.update_log)
         self.worker.finished.connect(self.proofreading_finished)
         
         # 启动工作线程
+        self._log_buffer.clear()
+        self._log_timer.start()
         self.worker.start()
         
     def stop_proofreading(self):
         """停止校对文档"""
         if self.worker and self.is_proofreading:
+            self.flush_log()
             self.log_text.append("正在停止校对...\n")
             self.worker.stop()
             
+    @pyqtSlot(int, int)
     def update_progress(self, current, total):
         """
         更新进度条
@@ -419,17 +573,28 @@ class MainWindow(QMainWindow):
             current: 当前进度
             total: 总数
         """
-        percentage = int(current * 100 / total)
+        percentage = current * 100 // total
+        # 百分比未变化时不重绘进度条
+        if percentage == self._last_pct:
+            return
+        self._last_pct = percentage
         self.progress_bar.setValue(percentage)
         
     def update_log(self, log_text):
         """
-        更新日志显示
+        更新日志显示，日志先写入缓冲区，由定时器批量刷新到界面
         
         Args:
             log_text: 日志文本
         """
-        self.log_text.append(log_text)
+        self._log_buffer.append(log_text)
+        
+    def flush_log(self):
+        """将缓冲区中的日志一次性追加到日志区域"""
+        if not self._log_buffer:
+            return
+        self.log_text.append("\n".join(self._log_buffer))
+        self._log_buffer.clear()
         # 滚动到底部
         self.log_text.moveCursor(QTextCursor.End)
         
@@ -441,6 +606,10 @@ class MainWindow(QMainWindow):
             success: 是否成功
             message: 保存路径或错误信息
         """
+        # 停止定时刷新，并输出剩余的日志
+        self._log_timer.stop()
+        self.flush_log()
+        
         self.is_proofreading = False
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
@@ -505,9 +674,12 @@ class MainWindow(QMainWindow):
     
     def show_export_dialog(self):
         """显示导出对话框"""
-        dialog = ExportDialog(self.file_path, self)
-        dialog.exportRequested.connect(self.export_logs)
-        dialog.exec_()
+        if self._export_dialog is None:
+            self._export_dialog = ExportDialog(self.file_path, self)
+            self._export_dialog.exportRequested.connect(self.export_logs)
+        else:
+            self._export_dialog.reset(self.file_path)
+        self._export_dialog.exec_()
         
     def export_logs(self, file_path, only_errors):
         """
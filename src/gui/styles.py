@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+界面样式模块
+提供应用程序共用的样式表
+"""
+
+import re
+
+
+def compact_qss(qss):
+    """
+    去除样式表中的注释和多余空白
+
+    Args:
+        qss: 样式表文本
+
+    Returns:
+        str: 压缩后的样式表
+    """
+    return re.sub(r'\s+', ' ', re.sub(r'/\*.*?\*/', '', qss)).strip()
+
+
+# 应用程序级样式表，由主窗口启动时设置一次，主窗口和各对话框只保留各自特有的样式
+APP_QSS = compact_qss("""
+    QDialog {
+        background-color: #FFFFFF;
+    }
+    QLabel {
+        font-size: 14px;
+        color: #202124;
+    }
+    QPushButton {
+        background-color: #1A73E8;
+        color: white;
+        border: none;
+        border-radius: 4px;
+        padding: 8px 16px;
+        font-size: 14px;
+        min-width: 80px;
+    }
+    QPushButton:hover {
+        background-color: #1967D2;
+    }
+    QPushButton:pressed {
+        background-color: #185ABC;
+    }
+    QPushButton:disabled {
+        background-color: #BDC1C6;
+        color: #FFFFFF;
+    }
+    QPushButton#cancel_button {
+        background-color: #FFFFFF;
+        color: #1A73E8;
+        border: 1px solid #DADCE0;
+    }
+    QPushButton#cancel_button:hover {
+        background-color: #F1F3F4;
+    }
+""")
@@ -7,19 +7,83 @@
 """
 
 import os
+import time
+import atexit
+import queue
 import logging
 import datetime
+import tempfile
+from logging.handlers import QueueHandler, QueueListener
+
+from src._json import dumps, loads
 
-# 配置日志
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 本模块日志的后台输出线程，首次创建 LogManager 时启动
+_listener = None
+
+# 导出日志时使用的分隔线
+SECTION_LINE = "=" * 50
+ENTRY_SEPARATOR = "\n" + "-" * 30 + "\n\n"
+
+# 导出日志文件和日志条目临时文件的读写缓冲区大小
+EXPORT_BUFFER_SIZE = 1 << 20
+
+# 日志条目类型：没有错误、发现错误、处理错误
+KIND_OK = 0
+KIND_ERROR = 1
+KIND_PROCESS_ERROR = 2
+
+def _format_ok(annotation, corrected, error_message):
+    """格式化没有错误的日志详情"""
+    return "没有错误\n"
+
+def _format_error(annotation, corrected, error_message):
+    """格式化发现错误的日志详情"""
+    return f"错误: {annotation}\n修正: {corrected}\n"
+
+def _format_process_error(annotation, corrected, error_message):
+    """格式化处理错误的日志详情"""
+    return f"处理错误: {error_message}\n"
+
+# 按日志条目类型索引的详情格式化函数
+FORMATTERS = (_format_ok, _format_error, _format_process_error)
+
+# 没有错误的日志条目在临时文件中的行首，只导出错误日志时无需解析即可跳过
+KIND_OK_PREFIX = f"[{KIND_OK},"
+
+def _start_queue_listener():
+    """
+    将本模块的日志改为经队列交给后台线程输出，校对过程中记录日志不必等待控制台和文件写入
+    
+    Returns:
+        QueueListener: 后台日志监听器，根日志未配置处理器时返回 None
+    """
+    global _listener
+    if _listener is None:
+        handlers = logging.getLogger().handlers
+        if not handlers:
+            return None
+        log_queue = queue.SimpleQueue()
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        logger.addHandler(QueueHandler(log_queue))
+        # 不再传播到根日志，避免同一条日志被输出两次
+        logger.propagate = False
+        _listener.start()
+        atexit.register(_listener.stop)
+    return _listener
+
 class LogManager:
     """日志管理类，负责记录和导出校对日志"""
     
     def __init__(self):
         """初始化日志管理器"""
-        self.logs = []
+        _start_queue_listener()
+        # 日志条目逐行写入临时文件，不在内存中保留
+        self._entries = None
+        self._entries_path = None
+        self.entry_count = 0
+        atexit.register(self._close_entries)
         self.error_count = 0
         self.total_count = 0
         self.start_time = None
@@ -28,12 +92,48 @@ class LogManager:
         
     def start_logging(self):
         """开始记录日志"""
-        self.logs = []
+        self._open_entries()
         self.error_count = 0
         self.total_count = 0
         self.start_time = datetime.datetime.now()
         logger.info("开始记录校对日志")
         
+    def _open_entries(self):
+        """创建保存日志条目的临时文件，每条日志写为一行JSON"""
+        self._close_entries()
+        fd, self._entries_path = tempfile.mkstemp(prefix='ai_docproof_', suffix='.jsonl')
+        self._entries = open(fd, 'w', encoding='utf-8', buffering=EXPORT_BUFFER_SIZE)
+        self.entry_count = 0
+        
+    def _close_entries(self):
+        """关闭并删除日志条目临时文件"""
+        if self._entries is not None:
+            self._entries.close()
+            self._entries = None
+        if self._entries_path is not None:
+            try:
+                os.remove(self._entries_path)
+            except OSError as e:
+                logger.warning(f"删除日志临时文件失败: {str(e)}")
+            self._entries_path = None
+        
+    def _append_entry(self, sentence, kind, annotation, corrected, error_message):
+        """
+        追加一条日志到临时文件
+        
+        Args:
+            sentence: 校对的句子
+            kind: 日志条目类型（KIND_OK、KIND_ERROR 或 KIND_PROCESS_ERROR）
+            annotation: 批注内容
+            corrected: 修正后的句子
+            error_message: 处理错误信息
+        """
+        if self._entries is None:
+            self._open_entries()
+        # 只记录时间戳，导出时再格式化
+        self._entries.write(dumps([kind, time.time(), sentence, annotation, corrected, error_message]) + "\n")
+        self.entry_count += 1
+        
     def log_sentence(self, sentence, result, has_error=False):
         """
         记录句子校对日志
@@ -47,26 +147,15 @@ class LogManager:
         
         if has_error:
             self.error_count += 1
-            log_entry = {
-                'time': datetime.datetime.now(),
-                'sentence': sentence,
-                'has_error': True,
-                'annotation': result.get('annotation', ''),
-                'corrected': result.get('content_1', '')
-            }
-            log_text = f"正在校对：{sentence}\n发现错误：{log_entry['annotation']}\n已在文档中批注\n"
+            annotation = result.get('annotation', '')
+            self._append_entry(sentence, KIND_ERROR, annotation, result.get('content_1', ''), None)
+            log_text = f"正在校对：{sentence}\n发现错误：{annotation}\n已在文档中批注\n"
         else:
-            log_entry = {
-                'time': datetime.datetime.now(),
-                'sentence': sentence,
-                'has_error': False,
-                'annotation': '',
-                'corrected': ''
-            }
+            self._append_entry(sentence, KIND_OK, None, None, None)
             log_text = f"正在校对：{sentence}\n没有错误\n"
             
-        self.logs.append(log_entry)
-        logger.info(log_text)
+        # 逐句日志只在调试级别输出，界面和导出文件中仍有完整记录
+        logger.debug(log_text)
         return log_text
         
     def log_error(self, sentence, error_message):
@@ -77,16 +166,9 @@ class LogManager:
             sentence: 校对的句子
             error_message: 错误信息
         """
-        log_entry = {
-            'time': datetime.datetime.now(),
-            'sentence': sentence,
-            'has_error': False,
-            'is_process_error': True,
-            'error_message': error_message
-        }
+        self._append_entry(sentence, KIND_PROCESS_ERROR, None, None, error_message)
         
         log_text = f"正在校对：{sentence}\n处理错误：{error_message}\n"
-        self.logs.append(log_entry)
         logger.error(log_text)
         return log_text
         
@@ -127,56 +209,55 @@ class LogManager:
             tuple: (是否成功, 输出路径或错误信息)
         """
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write("AI文档校对工具 - 校对日志\n")
-                f.write("=" * 50 + "\n\n")
+            # 先在内存中拼接头部内容，一次写入文件
+            parts = ["AI文档校对工具 - 校对日志\n", SECTION_LINE, "\n\n"]
+            
+            # 检查时间值是否为None
+            if self.start_time:
+                parts.append(f"校对开始时间: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+            else:
+                parts.append("校对开始时间: 未记录\n")
                 
-                # 检查时间值是否为None
-                if self.start_time:
-                    f.write(f"校对开始时间: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                else:
-                    f.write("校对开始时间: 未记录\n")
-                    
-                if self.end_time:
-                    f.write(f"校对结束时间: {self.end_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                else:
-                    f.write("校对结束时间: 未记录\n")
-                    
-                if self.start_time and self.end_time:
-                    f.write(f"校对用时: {(self.end_time - self.start_time).total_seconds():.2f} 秒\n")
-                else:
-                    f.write("校对用时: 未记录\n")
-                f.write(f"检查句子总数: {self.total_count}\n")
-                f.write(f"错误数量: {self.error_count}\n")
+            if self.end_time:
+                parts.append(f"校对结束时间: {self.end_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+            else:
+                parts.append("校对结束时间: 未记录\n")
                 
-                if self.save_path:
-                    f.write(f"文档保存位置: {self.save_path}\n")
-                    
-                f.write("\n" + "=" * 50 + "\n\n")
-                f.write("校对详情:\n\n")
+            if self.start_time and self.end_time:
+                parts.append(f"校对用时: {(self.end_time - self.start_time).total_seconds():.2f} 秒\n")
+            else:
+                parts.append("校对用时: 未记录\n")
+            parts.append(f"检查句子总数: {self.total_count}\n错误数量: {self.error_count}\n")
+            
+            if self.save_path:
+                parts.append(f"文档保存位置: {self.save_path}\n")
+                
+            parts.append(f"\n{SECTION_LINE}\n\n校对详情:\n\n")
+            
+            with open(output_path, 'w', encoding='utf-8', buffering=EXPORT_BUFFER_SIZE) as f:
+                f.write("".join(parts))
                 
-                for i, log in enumerate(self.logs):
-                    # 如果只导出错误日志，则跳过没有错误的条目
-                    if only_errors and not log.get('has_error') and not log.get('is_process_error', False):
-                        continue
-                        
-                    # 检查日志时间是否为None
-                    if log.get('time'):
-                        f.write(f"[{i+1}/{len(self.logs)}] {log['time'].strftime('%H:%M:%S')}\n")
-                    else:
-                        f.write(f"[{i+1}/{len(self.logs)}] 时间未记录\n")
-                    f.write(f"句子: {log['sentence']}\n")
-                    
-                    if log.get('is_process_error', False):
-                        f.write(f"处理错误: {log['error_message']}\n")
-                    elif log['has_error']:
-                        f.write(f"错误: {log['annotation']}\n")
-                        f.write(f"修正: {log['corrected']}\n")
-                    else:
-                        f.write("没有错误\n")
-                        
-                    f.write("\n" + "-" * 30 + "\n\n")
-                    
+                if self._entries is not None:
+                    # 从临时文件逐行读取日志条目，经写缓冲区输出
+                    self._entries.flush()
+                    total = self.entry_count
+                    # 同一秒内的条目共用格式化后的时间
+                    last_second = None
+                    time_str = ""
+                    with open(self._entries_path, 'r', encoding='utf-8', buffering=EXPORT_BUFFER_SIZE) as entries:
+                        for i, line in enumerate(entries):
+                            # 如果只导出错误日志，则跳过没有错误的条目
+                            if only_errors and line.startswith(KIND_OK_PREFIX):
+                                continue
+                                
+                            kind, timestamp, sentence, annotation, corrected, error_message = loads(line)
+                            second = int(timestamp)
+                            if second != last_second:
+                                last_second = second
+                                time_str = time.strftime('%H:%M:%S', time.localtime(second))
+                            detail = FORMATTERS[kind](annotation, corrected, error_message)
+                            f.write(f"[{i+1}/{total}] {time_str}\n句子: {sentence}\n{detail}{ENTRY_SEPARATOR}")
+                            
             logger.info(f"成功导出日志到: {output_path}")
             return True, output_path
             
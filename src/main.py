@@ -12,19 +12,20 @@ import logging
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtGui import QIcon
 
-from src.gui.main_window import MainWindow
-
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('ai_docproof.log', encoding='utf-8')
-    ]
-)
+# 配置日志，须在导入其他模块之前完成，确保文件日志处理器生效
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(),
+            logging.FileHandler('ai_docproof.log', encoding='utf-8')
+        ]
+    )
 logger = logging.getLogger(__name__)
 
+from src.gui.main_window import MainWindow
+
 def main():
     """程序入口函数"""
     try:
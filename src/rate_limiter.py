@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+请求限流模块
+负责控制并发API请求的数量和发送速率，遇到接口限流时自动降低并发和速率
+"""
+
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# 自适应并发的上限，与异步连接池大小一致
+MAX_CONCURRENCY = 32
+
+# 令牌桶速率的下限（每秒请求数），即每分钟至少发送一个请求
+MIN_REFILL_RATE = 1 / 60
+
+class AdaptiveLimiter:
+    """自适应并发控制类：请求顺利时逐步提高并发上限，遇到限流时减半"""
+
+    def __init__(self, initial=8, maximum=MAX_CONCURRENCY):
+        """
+        初始化并发控制器
+
+        Args:
+            initial: 初始并发上限
+            maximum: 并发上限的最大值
+        """
+        self.maximum = max(1, maximum)
+        self.limit = min(max(1, initial), self.maximum)
+        self.in_flight = 0
+        self._successes = 0
+        # 每次降低并发上限后递增，同一时段内的多次限流只减半一次
+        self._generation = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        """
+        等待直到进行中的请求数低于并发上限
+
+        Returns:
+            int: 获取时的调整代数，释放时传回
+        """
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+            return self._generation
+
+    async def release(self, generation, rate_limited=False):
+        """
+        释放一个并发名额，并根据请求是否被限流调整并发上限
+
+        Args:
+            generation: acquire 返回的调整代数
+            rate_limited: 请求期间是否遇到限流（HTTP 429）
+        """
+        async with self._condition:
+            self.in_flight -= 1
+            if rate_limited:
+                if generation == self._generation and self.limit > 1:
+                    self.limit //= 2
+                    self._successes = 0
+                    self._generation += 1
+                    logger.warning(f"API请求被限流，并发数降低为 {self.limit}")
+            else:
+                # 每连续成功一轮（数量等于当前上限）后并发数加一
+                self._successes += 1
+                if self._successes >= self.limit and self.limit < self.maximum:
+                    self.limit += 1
+                    self._successes = 0
+            self._condition.notify_all()
+
+
+class TokenBucket:
+    """令牌桶限速类：按每分钟请求数匀速发放令牌，遇到限流时速率减半，连续成功后逐步恢复"""
+
+    def __init__(self, requests_per_minute, capacity=None, recovery_successes=10):
+        """
+        初始化令牌桶
+
+        Args:
+            requests_per_minute: 每分钟允许的最大请求数
+            capacity: 令牌桶容量，即允许的突发请求数，默认为一秒内的请求数
+            recovery_successes: 连续成功多少次后提高一次速率
+        """
+        self.max_rate = requests_per_minute / 60
+        self.refill_rate = self.max_rate
+        self.capacity = capacity or max(1.0, self.max_rate)
+        self.tokens = self.capacity
+        self.recovery_successes = recovery_successes
+        self._successes = 0
+        # 每次降低速率后递增，同一时段内的多次限流只减半一次
+        self._generation = 0
+        self._updated = time.monotonic()
+        # 等待令牌的请求按先后顺序依次获取
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        """按当前速率补充自上次更新以来产生的令牌"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.refill_rate)
+        self._updated = now
+
+    async def acquire(self):
+        """
+        获取一个令牌，令牌不足时等待到下一个令牌产生
+
+        Returns:
+            int: 获取时的调整代数，记录结果时传回
+        """
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.refill_rate)
+                self._refill()
+            self.tokens -= 1
+            return self._generation
+
+    def record(self, generation, rate_limited=False):
+        """
+        记录一次请求结果并调整速率（加性增、乘性减）
+
+        Args:
+            generation: acquire 返回的调整代数
+            rate_limited: 请求期间是否遇到限流（HTTP 429）
+        """
+        # 先按调整前的速率结算令牌
+        self._refill()
+        if rate_limited:
+            if generation != self._generation:
+                return
+            self.refill_rate = max(MIN_REFILL_RATE, self.refill_rate / 2)
+            self._successes = 0
+            self._generation += 1
+            logger.warning(f"API请求被限流，请求速率降低为每分钟 {self.refill_rate * 60:.1f} 次")
+        elif self.refill_rate < self.max_rate:
+            self._successes += 1
+            if self._successes >= self.recovery_successes:
+                self.refill_rate = min(self.max_rate, self.refill_rate + self.max_rate / 10)
+                self._successes = 0
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+文档处理模块测试
+验证编译的边界扫描与分句正则的结果一致
+"""
+
+import random
+import unittest
+
+from src.doc_processor import DocProcessor, _sentence_ends
+
+try:
+    from src._native_split import sentence_ends as native_sentence_ends
+except ImportError:
+    native_sentence_ends = None
+
+# Unicode模式下\s匹配的全部空白字符
+WHITESPACE = [chr(c) for c in range(0x110000) if chr(c).isspace()]
+
+
+@unittest.skipIf(native_sentence_ends is None, "需要安装 numpy 和 numba")
+class SentenceEndsTest(unittest.TestCase):
+    """比较正则分句与编译的边界扫描找到的句子结束位置"""
+
+    def setUp(self):
+        self.sentence_end_re = DocProcessor()._sentence_end_re
+
+    def assertSameEnds(self, text):
+        self.assertEqual(native_sentence_ends(text), _sentence_ends(text, self.sentence_end_re), repr(text))
+
+    def test_unicode_spaces_end_sentences(self):
+        self.assertEqual(_sentence_ends('你好吗?　我很好。', self.sentence_end_re), [4])
+        self.assertEqual(_sentence_ends('Really!\xa0Yes', self.sentence_end_re), [7])
+        self.assertEqual(native_sentence_ends('你好吗?　我很好。'), [4])
+        self.assertEqual(native_sentence_ends('Really!\xa0Yes'), [7])
+
+    def test_every_whitespace_character(self):
+        for space in WHITESPACE:
+            for template in ('a.{0}b', 'a?{0}b', 'a!"{0}b', "a.'{0}", '。？！{0}x', '?{0}'):
+                self.assertSameEnds(template.format(space))
+
+    def test_random_text(self):
+        rng = random.Random(0)
+        alphabet = ['a', '中', '.', '?', '!', '"', "'", '。', '？', '！', ' ', '\n', '　', '\xa0', ' ']
+        for _ in range(5000):
+            self.assertSameEnds(''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 40))))
+
+
+if __name__ == '__main__':
+    unittest.main()
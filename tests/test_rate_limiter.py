@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+请求限流模块测试
+验证自适应并发控制和令牌桶的加性增、乘性减调整
+"""
+
+import asyncio
+import types
+import unittest
+from unittest import mock
+
+from src.rate_limiter import AdaptiveLimiter, TokenBucket, MIN_REFILL_RATE
+
+
+class AdaptiveLimiterTest(unittest.TestCase):
+    """自适应并发控制的获取、限流减半和逐步恢复"""
+
+    def test_simultaneous_rate_limits_cut_once(self):
+        async def scenario():
+            limiter = AdaptiveLimiter(initial=8)
+            generations = [await limiter.acquire() for _ in range(4)]
+            # 同一时段内发出的请求同时被限流，只减半一次
+            with self.assertLogs('src.rate_limiter', 'WARNING') as logs:
+                for generation in generations:
+                    await limiter.release(generation, rate_limited=True)
+            self.assertEqual(len(logs.output), 1)
+            self.assertEqual(limiter.limit, 4)
+            self.assertEqual(limiter.in_flight, 0)
+
+            # 减半之后发出的请求再被限流时继续减半
+            generation = await limiter.acquire()
+            with self.assertLogs('src.rate_limiter', 'WARNING'):
+                await limiter.release(generation, rate_limited=True)
+            self.assertEqual(limiter.limit, 2)
+
+        asyncio.run(scenario())
+
+    def test_ramp_up_does_not_advance_generation(self):
+        async def scenario():
+            limiter = AdaptiveLimiter(initial=4)
+            slow = await limiter.acquire()
+            # 慢请求期间其他请求连续成功使并发数加一，不影响它被限流时减半
+            for _ in range(4):
+                await limiter.release(await limiter.acquire())
+            self.assertEqual(limiter.limit, 5)
+            with self.assertLogs('src.rate_limiter', 'WARNING'):
+                await limiter.release(slow, rate_limited=True)
+            self.assertEqual(limiter.limit, 2)
+
+        asyncio.run(scenario())
+
+    def test_ramp_up_after_full_window(self):
+        async def scenario():
+            limiter = AdaptiveLimiter(initial=4, maximum=5)
+            for _ in range(3):
+                await limiter.release(await limiter.acquire())
+            self.assertEqual(limiter.limit, 4)
+            # 连续成功数达到当前上限后加一
+            await limiter.release(await limiter.acquire())
+            self.assertEqual(limiter.limit, 5)
+            # 不超过最大值
+            for _ in range(10):
+                await limiter.release(await limiter.acquire())
+            self.assertEqual(limiter.limit, 5)
+
+        asyncio.run(scenario())
+
+    def test_acquire_waits_for_free_slot(self):
+        async def scenario():
+            limiter = AdaptiveLimiter(initial=1)
+            generation = await limiter.acquire()
+            waiter = asyncio.ensure_future(limiter.acquire())
+            await asyncio.sleep(0)
+            self.assertFalse(waiter.done())
+            await limiter.release(generation)
+            await asyncio.wait_for(waiter, 1)
+            self.assertEqual(limiter.in_flight, 1)
+
+        asyncio.run(scenario())
+
+
+class FakeClock:
+    """代替 time.monotonic 和 asyncio.sleep 的模拟时钟，等待时直接推进时间"""
+
+    def __init__(self):
+        self.now = 0.0
+        self._sleep = asyncio.sleep
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        # 真实时钟在每次等待后总会前进，避免浮点误差导致极短的等待不推进时间
+        self.now += max(seconds, 1e-6)
+        await self._sleep(0)
+
+
+class TokenBucketTest(unittest.TestCase):
+    """令牌桶的匀速发放、限流减半和逐步恢复"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patches = [
+            mock.patch('src.rate_limiter.time', types.SimpleNamespace(monotonic=self.clock.monotonic)),
+            mock.patch('src.rate_limiter.asyncio.sleep', self.clock.sleep),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_pacing(self):
+        async def scenario():
+            bucket = TokenBucket(60, capacity=1)
+            times = []
+            for _ in range(4):
+                await bucket.acquire()
+                times.append(self.clock.now)
+            return times
+
+        # 每分钟60次即每秒一个令牌，第一个令牌来自初始容量
+        times = asyncio.run(scenario())
+        for actual, expected in zip(times, [0, 1, 2, 3]):
+            self.assertAlmostEqual(actual, expected)
+
+    def test_rate_limit_halves_once_per_generation(self):
+        async def scenario():
+            bucket = TokenBucket(600)
+            stale = await bucket.acquire()
+            generation = await bucket.acquire()
+            with self.assertLogs('src.rate_limiter', 'WARNING'):
+                bucket.record(generation, rate_limited=True)
+            self.assertAlmostEqual(bucket.refill_rate, 5)
+            # 降速前获取的令牌再报告限流时不再减半
+            bucket.record(stale, rate_limited=True)
+            self.assertAlmostEqual(bucket.refill_rate, 5)
+
+        asyncio.run(scenario())
+
+    def test_rate_never_drops_below_minimum(self):
+        async def scenario():
+            bucket = TokenBucket(60)
+            with self.assertLogs('src.rate_limiter', 'WARNING'):
+                for _ in range(10):
+                    bucket.record(await bucket.acquire(), rate_limited=True)
+            self.assertAlmostEqual(bucket.refill_rate, MIN_REFILL_RATE)
+
+        asyncio.run(scenario())
+
+    def test_recovery_after_successes(self):
+        async def scenario():
+            bucket = TokenBucket(600, recovery_successes=2)
+            with self.assertLogs('src.rate_limiter', 'WARNING'):
+                bucket.record(await bucket.acquire(), rate_limited=True)
+            self.assertAlmostEqual(bucket.refill_rate, 5)
+            # 每连续成功 recovery_successes 次，速率增加最大速率的十分之一
+            bucket.record(await bucket.acquire())
+            self.assertAlmostEqual(bucket.refill_rate, 5)
+            bucket.record(await bucket.acquire())
+            self.assertAlmostEqual(bucket.refill_rate, 6)
+            # 恢复到最大速率后不再增加
+            for _ in range(20):
+                bucket.record(await bucket.acquire())
+            self.assertAlmostEqual(bucket.refill_rate, bucket.max_rate)
+
+        asyncio.run(scenario())
+
+if __name__ == '__main__':
+    unittest.main()